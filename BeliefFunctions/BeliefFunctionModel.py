@@ -4,18 +4,76 @@ Modélisation d'une base de connaissances stratifiée avec les fonctions de croy
 """
 
 import numpy as np
-import pandas as pd
-import csv
 import os
+import sys
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # numba est optionnel : sans lui, les noyaux ci-dessous s'exécutent en Python pur
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+SEPARATOR = "=" * 80
+VAR_SEPARATOR = "=" * 60
 
 # Cadre de discernement : Valeurs booléennes pour les variables {a, b, c, d, e, f}
 # Chaque variable peut être Vraie ou Fausse
 
+
+@njit(cache=True, fastmath=True)
+def _combine_binary(m1, m2):
+    """Règle de Dempster sur deux vecteurs [m(V), m(F), m(Θ)] (noyau compilé)"""
+    conflict = m1[0] * m2[1] + m1[1] * m2[0]
+    combined = np.empty(3)
+    combined[0] = m1[0] * m2[0] + m1[0] * m2[2] + m1[2] * m2[0]
+    combined[1] = m1[1] * m2[1] + m1[1] * m2[2] + m1[2] * m2[1]
+    combined[2] = m1[2] * m2[2]
+    
+    if conflict < 1:
+        for k in range(3):
+            combined[k] /= (1 - conflict)
+    
+    return combined, conflict
+
+
+@njit(cache=True, fastmath=True)
+def _combine_sequence(masses):
+    """Combine successivement les sources (lignes de masses) ; renvoie la masse finale et les conflits"""
+    combined = masses[0].copy()
+    conflicts = np.zeros(masses.shape[0] - 1)
+    for i in range(1, masses.shape[0]):
+        combined, conflicts[i - 1] = _combine_binary(combined, masses[i])
+    return combined, conflicts
+
+
+if NUMBA_AVAILABLE:
+    # Compilation anticipée (mise en cache sur disque grâce à cache=True)
+    _combine_sequence(np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]))
+
 class BeliefFunctionKB:
     """
     Modélise une base de connaissances stratifiée avec la théorie de Dempster-Shafer
     """
     
+    # Ensembles focaux du cadre binaire d'une variable : 0 = {V}, 1 = {F}, 2 = Θ = {V, F}
+    FOCAL_V, FOCAL_F, FOCAL_THETA = 0, 1, 2
+    FOCAL_SUFFIXES = ('V', 'F', '?')
+    FOCAL_SLOTS = {suffix: i for i, suffix in enumerate(FOCAL_SUFFIXES)}
+    
+    # Ensembles focaux codés en masques de bits (bit 0 = V, bit 1 = F) : l'intersection est un ET binaire
+    FOCAL_MASKS = np.array([0b01, 0b10, 0b11], dtype=np.uint64)
+    
+    # INTERSECT_IDX[i, j] = indice de l'intersection des ensembles focaux i et j (-1 = conflit)
+    CONFLICT = (FOCAL_MASKS[:, None] & FOCAL_MASKS[None, :]) == 0
+    INTERSECT_IDX = np.where(CONFLICT, -1,
+                             np.searchsorted(FOCAL_MASKS, FOCAL_MASKS[:, None] & FOCAL_MASKS[None, :]))
+    
     def __init__(self):
         # Définir la base de connaissances stratifiée
         # Correspondance : a=1, b=2, c=3, d=4, e=5, f=6
@@ -33,56 +91,112 @@ class BeliefFunctionKB:
         
         self.variables = ['a', 'b', 'c', 'd', 'e', 'f']
         self.variable_map = {i+1: var for i, var in enumerate(self.variables)}
+        self._var_idx = {var: i+1 for i, var in enumerate(self.variables)}
+        
+        # Libellés des ensembles focaux ('a=V', 'a=F', 'a=?'), formatés une seule fois par variable
+        self._focal_labels = {var: self._format_labels(var) for var in self.variables}
+        
+        # Encodage compact (type CSR) des clauses, construit une seule fois :
+        # les littéraux de chaque clause sont contigus dans clause_lits[clause_offsets[k]:clause_offsets[k+1]]
+        # et la clause k appartient à la strate clause_stratum_idx[k]
+        n_strata = len(self.strata)
+        n_vars = len(self.variables)
+        clauses = [(s, clause) for s, stratum in enumerate(self.strata) for clause in stratum['clauses']]
+        
+        # Les poids et masses sont bornés dans [0, 1] : la simple précision suffit
+        self.stratum_weights = np.array([stratum['weight'] for stratum in self.strata], dtype=np.float32)
+        self.clause_lits = np.array([lit for _, clause in clauses for lit in clause], dtype=np.int8)
+        self.clause_offsets = np.cumsum([0] + [len(clause) for _, clause in clauses])
+        self.clause_stratum_idx = np.array([s for s, _ in clauses])
+        
+        # Occurrences (clause, variable) positives et négatives, comptées une fois par clause ;
+        # une occurrence positive l'emporte sur une négative dans la même clause
+        lit_clause = np.repeat(np.arange(len(clauses)), np.diff(self.clause_offsets))
+        var_of_lit = np.abs(self.clause_lits).astype(np.intp) - 1
+        is_pos = self.clause_lits > 0
+        pos_keys = np.unique(lit_clause[is_pos] * n_vars + var_of_lit[is_pos])
+        neg_keys = np.setdiff1d(lit_clause[~is_pos] * n_vars + var_of_lit[~is_pos], pos_keys)
+        
+        # Nombre d'occurrences par strate : pos_counts[s, v] / neg_counts[s, v]
+        def stratum_counts(keys):
+            cells = self.clause_stratum_idx[keys // n_vars] * n_vars + keys % n_vars
+            counts = np.bincount(cells, minlength=n_strata * n_vars)
+            return counts.reshape(n_strata, n_vars).astype(np.float32)
+        
+        self.pos_counts = stratum_counts(pos_keys)
+        self.neg_counts = stratum_counts(neg_keys)
+        
+        # Table des croyances précalculée : une ligne par variable,
+        # colonnes [croyance vraie, croyance fausse, incertitude] déjà normalisées
+        inv_n = np.float32(1.0 / n_strata)
+        scaled_weights = self.stratum_weights * inv_n
+        raw_true = np.einsum('s,sv->v', scaled_weights, self.pos_counts)
+        raw_false = np.einsum('s,sv->v', scaled_weights, self.neg_counts)
+        
+        total = raw_true + raw_false
+        norm = np.where(total > 0, total, np.float32(1.0))
+        belief_true = raw_true / norm
+        belief_false = raw_false / norm
+        uncertainty = 1 - (belief_true + belief_false)
         
-    def create_mass_function_for_variable(self, var_name):
+        self._belief_table = np.column_stack([belief_true, belief_false, uncertainty]).astype(np.float32)
+        
+    def _format_labels(self, var_name):
+        """Libellés des ensembles focaux d'une variable, dans l'ordre des indices FOCAL_*"""
+        return tuple(f'{var_name}={suffix}' for suffix in self.FOCAL_SUFFIXES)
+    
+    def focal_labels(self, var_name):
+        """Retourne les libellés (V, F, Θ) d'une variable sans les reformater à chaque appel"""
+        labels = self._focal_labels.get(var_name)
+        if labels is None:
+            labels = self._focal_labels[var_name] = self._format_labels(var_name)
+        return labels
+    
+    def compute_beliefs(self, var_name):
         """
-        Crée une fonction de masse pour une variable spécifique basée sur la base de connaissances
+        Retourne les affectations de masse d'une variable, sans construire de fonction de masse
         
         Args:
             var_name: Nom de la variable ('a', 'b', 'c', 'd', 'e', 'f')
         
         Returns:
-            MassFunction: Croyance et plausibilité pour la variable
+            Tuple (croyance vraie, croyance fausse, incertitude)
         """
-        var_idx = self.variables.index(var_name) + 1
-        
-        # Calculer les affectations de masse
+        # Affectations de masse (précalculées dans __init__) :
         # m({var}) = croyance que var est vraie
         # m({¬var}) = croyance que var est fausse  
         # m({var, ¬var}) = incertitude
+        belief_true, belief_false, uncertainty = self._belief_table[self._var_idx[var_name] - 1].tolist()
+        return belief_true, belief_false, uncertainty
+    
+    def format_mass(self, var_name):
+        """
+        Génère les ensembles focaux significatifs (masse > 0.001) d'une variable
         
-        # Utiliser les poids des strates pour déterminer la croyance
-        belief_true = 0
-        belief_false = 0
-        
-        for stratum in self.strata:
-            weight = stratum['weight']
-            for clause in stratum['clauses']:
-                # Vérifier si la variable apparaît dans la clause
-                if var_idx in clause:
-                    belief_true += weight / len(self.strata)
-                elif -var_idx in clause:
-                    belief_false += weight / len(self.strata)
-        
-        # Normaliser
-        total = belief_true + belief_false
-        if total > 0:
-            belief_true /= total
-            belief_false /= total
-        
-        uncertainty = 1 - (belief_true + belief_false)
+        Args:
+            var_name: Nom de la variable
         
-        # Créer la fonction de masse
+        Yields:
+            Tuples (ensemble focal, masse)
+        """
         # Cadre de discernement pour cette variable : {V, F}
-        mass_dict = {}
-        
-        if belief_true > 0.001:
-            mass_dict[f'{var_name}=V'] = belief_true
-        if belief_false > 0.001:
-            mass_dict[f'{var_name}=F'] = belief_false
-        if uncertainty > 0.001:
-            mass_dict[f'{var_name}=?'] = uncertainty
-            
+        for label, mass in zip(self.focal_labels(var_name), self.compute_beliefs(var_name)):
+            if mass > 0.001:
+                yield label, mass
+    
+    def create_mass_function_for_variable(self, var_name):
+        """
+        Crée une fonction de masse pour une variable spécifique basée sur la base de connaissances
+        
+        Args:
+            var_name: Nom de la variable ('a', 'b', 'c', 'd', 'e', 'f')
+        
+        Returns:
+            MassFunction: Croyance et plausibilité pour la variable
+        """
+        belief_true, belief_false, uncertainty = self.compute_beliefs(var_name)
+        mass_dict = dict(self.format_mass(var_name))
+        
         return mass_dict, belief_true, belief_false, uncertainty
     
     def create_mass_from_strata(self, var_name, interest_value):
@@ -96,21 +210,162 @@ class BeliefFunctionKB:
         Returns:
             Dictionnaire représentant la fonction de masse
         """
+        labels = self.focal_labels(var_name)
+        
         if interest_value > 0:
             # Valeur d'intérêt plus élevée = croyance plus forte
             belief = interest_value
             uncertainty = 1 - belief
             
             return {
-                f'{var_name}=V': belief,
-                f'{var_name}=?': uncertainty
+                labels[self.FOCAL_V]: belief,
+                labels[self.FOCAL_THETA]: uncertainty
             }
         else:
             # Aucune preuve
             return {
-                f'{var_name}=?': 1.0
+                labels[self.FOCAL_THETA]: 1.0
             }
     
+    def mass_to_vec(self, mass_func):
+        """
+        Convertit une fonction de masse (dictionnaire) en vecteur [m(V), m(F), m(Θ)]
+        
+        Args:
+            mass_func: Dictionnaire représentant la fonction de masse (ex: {'d=V': 0.14, 'd=?': 0.86})
+        
+        Returns:
+            Tuple (nom de la variable, vecteur numpy de longueur 3)
+        """
+        var_name = None
+        vec = np.zeros(len(self.FOCAL_SUFFIXES))
+        
+        # Chaque clé est classée une seule fois par simple recherche dans FOCAL_SLOTS
+        for key, mass in mass_func.items():
+            var_name, _, suffix = key.partition('=')
+            vec[self.FOCAL_SLOTS[suffix]] += mass
+        
+        return var_name, vec
+    
+    def vec_to_mass(self, var_name, vec):
+        """
+        Convertit un vecteur [m(V), m(F), m(Θ)] en fonction de masse (dictionnaire)
+        
+        Args:
+            var_name: Nom de la variable
+            vec: Vecteur numpy de longueur 3
+        
+        Returns:
+            Dictionnaire représentant la fonction de masse (ensembles focaux de masse non nulle)
+        """
+        return {label: float(mass)
+                for label, mass in zip(self.focal_labels(var_name), vec) if mass > 0}
+    
+    def create_masses_from_interest(self, interest_values):
+        """
+        Version vectorisée de create_mass_from_strata pour plusieurs variables à la fois
+        
+        Args:
+            interest_values: Tableau numpy des valeurs d'intérêt (une par variable)
+        
+        Returns:
+            Tableau numpy (n_variables, 3) des vecteurs de masse [m(V), m(F), m(Θ)]
+        """
+        has_evidence = interest_values > 0
+        masses = np.zeros((len(interest_values), 3))
+        masses[:, self.FOCAL_V] = np.where(has_evidence, interest_values, 0.0)
+        masses[:, self.FOCAL_THETA] = np.where(has_evidence, 1 - interest_values, 1.0)
+        return masses
+    
+    def dempster_combination_vec(self, m1, m2):
+        """
+        Règle de combinaison de Dempster sur des vecteurs de masse [m(V), m(F), m(Θ)]
+        
+        Args:
+            m1, m2: Vecteurs numpy de longueur 3
+        
+        Returns:
+            Tuple (vecteur de masse combiné, conflit)
+        """
+        # Produits de toutes les paires d'ensembles focaux
+        outer = np.outer(m1, m2)
+        conflict = outer[self.CONFLICT].sum()
+        
+        combined = np.zeros(3)
+        np.add.at(combined, self.INTERSECT_IDX[~self.CONFLICT], outer[~self.CONFLICT])
+        
+        # Normaliser par (1 - conflit)
+        if conflict < 1:
+            combined /= (1 - conflict)
+        
+        return combined, float(conflict)
+    
+    def dempster_combination_masks(self, masks1, m1, masks2, m2):
+        """
+        Règle de Dempster générique sur des ensembles focaux codés en masques de bits
+        (cadres jusqu'à 64 éléments)
+        
+        Args:
+            masks1, masks2: Tableaux numpy uint64 des ensembles focaux de chaque source
+            m1, m2: Tableaux numpy des masses associées
+        
+        Returns:
+            Tuple (masques des ensembles focaux combinés, masses combinées, conflit)
+        """
+        masks1 = np.asarray(masks1, dtype=np.uint64)
+        masks2 = np.asarray(masks2, dtype=np.uint64)
+        
+        intersection = (masks1[:, None] & masks2[None, :]).ravel()
+        products = np.outer(m1, m2).ravel()
+        
+        conflict_mask = intersection == 0
+        conflict = products[conflict_mask].sum()
+        
+        focal, inverse = np.unique(intersection[~conflict_mask], return_inverse=True)
+        combined = np.zeros(len(focal))
+        np.add.at(combined, inverse, products[~conflict_mask])
+        
+        # Normaliser par (1 - conflit)
+        if conflict < 1:
+            combined /= (1 - conflict)
+        
+        return focal, combined, float(conflict)
+    
+    def dempster_binary(self, v1, t1, v2, t2, f1=0, f2=0):
+        """
+        Règle de Dempster sous forme close pour le cadre binaire {V, F}
+        
+        Args:
+            v1, t1, f1: Masses m1({V}), m1(Θ), m1({F}) de la première source
+            v2, t2, f2: Masses m2({V}), m2(Θ), m2({F}) de la seconde source
+        
+        Returns:
+            Tuple ((m({V}), m({F}), m(Θ)) combinées, conflit)
+        """
+        conflict = v1 * f2 + f1 * v2
+        c_v = v1 * v2 + v1 * t2 + t1 * v2
+        c_f = f1 * f2 + f1 * t2 + t1 * f2
+        c_t = t1 * t2
+        
+        # Normaliser par (1 - conflit)
+        if conflict < 1:
+            norm = 1 - conflict
+            c_v, c_f, c_t = c_v / norm, c_f / norm, c_t / norm
+        
+        return (c_v, c_f, c_t), conflict
+    
+    def combine_sources(self, mass_vecs):
+        """
+        Combine successivement plusieurs sources par la règle de Dempster
+        
+        Args:
+            mass_vecs: Séquence de vecteurs de masse [m(V), m(F), m(Θ)] (au moins un)
+        
+        Returns:
+            Tuple (vecteur de masse combiné, conflits de chaque combinaison)
+        """
+        return _combine_sequence(np.asarray(mass_vecs, dtype=np.float64))
+    
     def dempster_combination(self, mass1, mass2):
         """
         Combine deux fonctions de masse en utilisant la règle de combinaison de Dempster
@@ -121,173 +376,194 @@ class BeliefFunctionKB:
         Returns:
             Fonction de masse combinée
         """
-        combined = {}
-        conflict = 0
-        
-        # Calculer l'intersection de tous les ensembles focaux
-        for key1, val1 in mass1.items():
-            for key2, val2 in mass2.items():
-                # Calculer l'intersection
-                if key1 == key2:
-                    # Même élément focal
-                    intersection = key1
-                elif '?' in key1:
-                    intersection = key2
-                elif '?' in key2:
-                    intersection = key1
-                else:
-                    # Conflit : affectations différentes
-                    conflict += val1 * val2
-                    continue
-                
-                # Ajouter la masse
-                if intersection in combined:
-                    combined[intersection] += val1 * val2
-                else:
-                    combined[intersection] = val1 * val2
+        var_name, m1 = self.mass_to_vec(mass1)
+        _, m2 = self.mass_to_vec(mass2)
         
-        # Normaliser par (1 - conflit)
-        if conflict < 1:
-            for key in combined:
-                combined[key] /= (1 - conflict)
+        combined, conflict = self.dempster_combination_vec(m1, m2)
         
-        return combined, conflict
+        return self.vec_to_mass(var_name, combined), conflict
     
     def calculate_belief_plausibility(self, mass_func, hypothesis):
         """
         Calcule la croyance et la plausibilité pour une hypothèse
         
         Args:
-            mass_func: Dictionnaire représentant la fonction de masse
-            hypothesis: Hypothèse à évaluer (ex: 'a=V')
+            mass_func: Dictionnaire ou vecteur [m(V), m(F), m(Θ)] représentant la fonction de masse
+            hypothesis: Hypothèse à évaluer (ex: 'a=V', ou directement FOCAL_V / FOCAL_F)
         
         Returns:
             Tuple (croyance, plausibilité)
         """
-        belief = 0
-        plausibility = 0
+        if isinstance(mass_func, dict):
+            _, mass_func = self.mass_to_vec(mass_func)
         
-        for focal_set, mass in mass_func.items():
-            # Croyance : somme des masses des sous-ensembles de l'hypothèse
-            if hypothesis in focal_set and '?' not in focal_set:
-                belief += mass
-            
-            # Plausibilité : somme des masses qui intersectent avec l'hypothèse
-            if hypothesis in focal_set or '?' in focal_set:
-                plausibility += mass
-        
-        return belief, plausibility
+        if isinstance(hypothesis, str):
+            hypothesis = self.FOCAL_SLOTS[hypothesis.partition('=')[2]]
+        return self.belief_plausibility_vec(mass_func, hypothesis)
     
-    def generate_report(self):
+    def belief_plausibility_vec(self, m, hyp_idx):
         """
-        Génère un rapport complet des fonctions de croyance pour toutes les variables
+        Calcule la croyance et la plausibilité d'un singleton sur un vecteur de masse
+        
+        Args:
+            m: Vecteur numpy [m(V), m(F), m(Θ)]
+            hyp_idx: Indice du singleton évalué (FOCAL_V ou FOCAL_F)
+        
+        Returns:
+            Tuple (croyance, plausibilité)
         """
-        print("=" * 80)
-        print("MODÈLE DE FONCTIONS DE CROYANCE - Base de Connaissances Stratifiée")
-        print("=" * 80)
-        print()
+        # Bel({x}) = m({x}) ; Pl({x}) = m({x}) + m(Θ)
+        return float(m[hyp_idx]), float(m[hyp_idx] + m[self.FOCAL_THETA])
+    
+    def load_interest_values(self, interest_file):
+        """
+        Charge les valeurs d'intérêt calculées par la théorie des possibilités
         
-        # Charger les valeurs d'intérêt des exercices précédents
-        interest_values = {}
-        interest_file = os.path.join('..', 'PossibilityTheory', 'interest_values.csv')
+        Args:
+            interest_file: Chemin du fichier CSV (colonnes 'Variable' et 'Interest Value')
+        
+        Returns:
+            Dictionnaire {nom de variable: valeur d'intérêt}
+        
+        Raises:
+            ValueError: Si le fichier existe mais n'a pas le format attendu
+        """
+        # pandas n'est importé que pour les entrées/sorties CSV (import coûteux)
+        import pandas as pd
         
         try:
             with open(interest_file, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    var_idx = int(row['Variable'])
-                    interest_values[self.variable_map[var_idx]] = float(row['Interest Value'])
-        except:
+                df_iv = pd.read_csv(f)
+        except FileNotFoundError:
             print("Note : Utilisation des valeurs d'intérêt par défaut (fichier introuvable)")
-            interest_values = {'a': 0, 'b': 0.6, 'c': 0.6, 'd': 0.14, 'e': 0, 'f': 0}
+            return {'a': 0, 'b': 0.6, 'c': 0.6, 'd': 0.14, 'e': 0, 'f': 0}
         
-        results = []
+        # Les erreurs de format ne doivent pas être masquées par les valeurs par défaut
+        try:
+            df_iv = df_iv[['Variable', 'Interest Value']].astype(
+                {'Variable': np.int8, 'Interest Value': np.float64})
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Format invalide pour {interest_file} : {e}") from e
+        
+        names = df_iv['Variable'].map(self.variable_map)
+        if names.isna().any():
+            unknown = df_iv['Variable'][names.isna()].tolist()
+            raise ValueError(f"Variables inconnues dans {interest_file} : {unknown}")
+        
+        return dict(zip(names, df_iv['Interest Value'].tolist()))
+    
+    def generate_report(self):
+        """
+        Génère un rapport complet des fonctions de croyance pour toutes les variables
+        """
+        # La sortie est accumulée puis écrite en une seule fois
+        out = [SEPARATOR,
+               "MODÈLE DE FONCTIONS DE CROYANCE - Base de Connaissances Stratifiée",
+               SEPARATOR,
+               ""]
+        sys.stdout.write("\n".join(out) + "\n")
+        out = []
         
-        for var in self.variables:
-            print(f"\n{'='*60}")
-            print(f"Variable: {var}")
-            print(f"{'='*60}")
+        # Charger les valeurs d'intérêt des exercices précédents
+        interest_file = os.path.join('..', 'PossibilityTheory', 'interest_values.csv')
+        interest_values = self.load_interest_values(interest_file)
+        
+        # Toutes les fonctions de masse issues des valeurs d'intérêt, en une seule passe
+        iv_arr = np.array([interest_values.get(var, 0) for var in self.variables], dtype=float)
+        interest_masses = self.create_masses_from_interest(iv_arr)
+        
+        bel_true = interest_masses[:, self.FOCAL_V]
+        pl_true = interest_masses[:, self.FOCAL_V] + interest_masses[:, self.FOCAL_THETA]
+        bel_false = interest_masses[:, self.FOCAL_F]
+        pl_false = interest_masses[:, self.FOCAL_F] + interest_masses[:, self.FOCAL_THETA]
+        
+        import pandas as pd
+        
+        df = pd.DataFrame({
+            'Variable': self.variables,
+            'Valeur_Interet': iv_arr,
+            'Bel_Vrai': bel_true,
+            'Pl_Vrai': pl_true,
+            'Bel_Faux': bel_false,
+            'Pl_Faux': pl_false,
+            'Incertitude': pl_true - bel_true
+        })
+        
+        for i, var in enumerate(self.variables):
+            out.append(f"\n{VAR_SEPARATOR}")
+            out.append(f"Variable: {var}")
+            out.append(VAR_SEPARATOR)
             
             # Méthode 1 : Direct depuis la structure de la base de connaissances
-            mass_dict1, bel_t, bel_f, unc = self.create_mass_function_for_variable(var)
-            
-            print(f"\n1. Fonction de Masse depuis la Structure BC :")
-            for focal_set, mass in mass_dict1.items():
-                print(f"   m({focal_set}) = {mass:.4f}")
+            out.append(f"\n1. Fonction de Masse depuis la Structure BC :")
+            for focal_set, mass in self.format_mass(var):
+                out.append(f"   m({focal_set}) = {mass:.4f}")
             
             # Méthode 2 : Depuis les valeurs d'intérêt
             interest_val = interest_values.get(var, 0)
-            mass_dict2 = self.create_mass_from_strata(var, interest_val)
+            mass_dict2 = self.vec_to_mass(var, interest_masses[i])
             
-            print(f"\n2. Fonction de Masse depuis la Valeur d'Intérêt ({interest_val}) :")
+            out.append(f"\n2. Fonction de Masse depuis la Valeur d'Intérêt ({interest_val}) :")
             for focal_set, mass in mass_dict2.items():
-                print(f"   m({focal_set}) = {mass:.4f}")
-            
-            # Calculer la croyance et la plausibilité
-            bel_true, pl_true = self.calculate_belief_plausibility(mass_dict2, f'{var}=V')
-            bel_false, pl_false = self.calculate_belief_plausibility(mass_dict2, f'{var}=F')
+                out.append(f"   m({focal_set}) = {mass:.4f}")
             
-            print(f"\n3. Croyance et Plausibilité :")
-            print(f"   Bel({var}=Vrai)  = {bel_true:.4f}")
-            print(f"   Pl({var}=Vrai)   = {pl_true:.4f}")
-            print(f"   Bel({var}=Faux)  = {bel_false:.4f}")
-            print(f"   Pl({var}=Faux)   = {pl_false:.4f}")
-            print(f"   Intervalle d'Incertitude: [{bel_true:.4f}, {pl_true:.4f}]")
-            
-            results.append({
-                'Variable': var,
-                'Valeur_Interet': interest_val,
-                'Bel_Vrai': bel_true,
-                'Pl_Vrai': pl_true,
-                'Bel_Faux': bel_false,
-                'Pl_Faux': pl_false,
-                'Incertitude': pl_true - bel_true
-            })
+            # Croyance et plausibilité (calculées ci-dessus pour toutes les variables)
+            out.append(f"\n3. Croyance et Plausibilité :")
+            out.append(f"   Bel({var}=Vrai)  = {bel_true[i]:.4f}")
+            out.append(f"   Pl({var}=Vrai)   = {pl_true[i]:.4f}")
+            out.append(f"   Bel({var}=Faux)  = {bel_false[i]:.4f}")
+            out.append(f"   Pl({var}=Faux)   = {pl_false[i]:.4f}")
+            out.append(f"   Intervalle d'Incertitude: [{bel_true[i]:.4f}, {pl_true[i]:.4f}]")
         
         # Sauvegarder les résultats
-        df = pd.DataFrame(results)
         df.to_csv('resultats_fonctions_croyance.csv', index=False)
-        print("\n" + "="*80)
-        print("Résultats sauvegardés dans : resultats_fonctions_croyance.csv")
-        print("="*80)
+        out.append("\n" + SEPARATOR)
+        out.append("Résultats sauvegardés dans : resultats_fonctions_croyance.csv")
+        out.append(SEPARATOR)
+        sys.stdout.write("\n".join(out) + "\n")
         
+        results = df.to_dict('records')
         return results
     
     def demonstrate_combination(self):
         """
         Démontre la règle de combinaison de Dempster
         """
-        print("\n" + "="*80)
-        print("RÈGLE DE COMBINAISON DE DEMPSTER - Exemple")
-        print("="*80)
+        out = []
+        out.append("\n" + SEPARATOR)
+        out.append("RÈGLE DE COMBINAISON DE DEMPSTER - Exemple")
+        out.append(SEPARATOR)
         
         # Exemple : Combiner les preuves pour la variable 'd' depuis deux sources
-        print("\nCombinaison des preuves pour la variable 'd' :")
+        out.append("\nCombinaison des preuves pour la variable 'd' :")
         
         # Source 1 : Depuis la valeur d'intérêt (0.14)
         mass1 = {'d=V': 0.14, 'd=?': 0.86}
-        print("\nSource 1 (Valeur d'Intérêt) :")
+        out.append("\nSource 1 (Valeur d'Intérêt) :")
         for k, v in mass1.items():
-            print(f"   m1({k}) = {v:.4f}")
+            out.append(f"   m1({k}) = {v:.4f}")
         
         # Source 2 : Preuve forte depuis le poids des strates
         mass2 = {'d=V': 0.60, 'd=?': 0.40}
-        print("\nSource 2 (Analyse des Strates) :")
+        out.append("\nSource 2 (Analyse des Strates) :")
         for k, v in mass2.items():
-            print(f"   m2({k}) = {v:.4f}")
+            out.append(f"   m2({k}) = {v:.4f}")
         
-        # Combiner
-        combined, conflict = self.dempster_combination(mass1, mass2)
+        # Combiner (forme close du cadre binaire)
+        combined_vec, conflict = self.dempster_binary(mass1['d=V'], mass1['d=?'],
+                                                      mass2['d=V'], mass2['d=?'])
+        combined = self.vec_to_mass('d', combined_vec)
         
-        print(f"\nFonction de Masse Combinée (Conflit = {conflict:.4f}) :")
+        out.append(f"\nFonction de Masse Combinée (Conflit = {conflict:.4f}) :")
         for k, v in combined.items():
-            print(f"   m({k}) = {v:.4f}")
-        
-        bel, pl = self.calculate_belief_plausibility(combined, 'd=V')
-        print(f"\nÉvaluation Finale :")
-        print(f"   Bel(d=Vrai) = {bel:.4f}")
-        print(f"   Pl(d=Vrai)  = {pl:.4f}")
-        print(f"   Incertitude = {pl - bel:.4f}")
+            out.append(f"   m({k}) = {v:.4f}")
+        
+        bel, pl = self.belief_plausibility_vec(combined_vec, self.FOCAL_V)
+        out.append(f"\nÉvaluation Finale :")
+        out.append(f"   Bel(d=Vrai) = {bel:.4f}")
+        out.append(f"   Pl(d=Vrai)  = {pl:.4f}")
+        out.append(f"   Incertitude = {pl - bel:.4f}")
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
@@ -307,9 +583,9 @@ def main():
     # Démontrer la combinaison
     model.demonstrate_combination()
     
-    print("\n" + "="*80)
+    print("\n" + SEPARATOR)
     print("Analyse Terminée !")
-    print("="*80 + "\n")
+    print(SEPARATOR + "\n")
 
 
 if __name__ == "__main__":
@@ -12,13 +12,135 @@ Hypothèses de diagnostic:
 - Problème Logiciel (S)
 """
 
+import math
 import numpy as np
-import pandas as pd
+from dataclasses import dataclass, field
+from typing import Optional
 from itertools import combinations, chain
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.table import Table
-import os
+from functools import lru_cache, reduce
+from operator import or_
+from pathlib import Path
+import csv
+import sys
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # numba est optionnel : sans lui, _combine_kernel se rabat sur _combine_numpy (voir plus bas)
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Signature explicite : compilation dès l'import (masques uint8, masses float64),
+# sans appel de préchauffage ni recompilation pour d'autres types
+@njit("float64(uint8[::1], float64[::1], uint8[::1], float64[::1], float64[::1])", cache=True)
+def _combine(masks1, vals1, masks2, vals2, out_mass):
+    """
+    Accumule dans out_mass (indexé par masque) les produits des masses de chaque paire
+    d'ensembles focaux ; out_mass[0] reçoit le conflit, qui est retourné
+    """
+    full = out_mass.shape[0] - 1  # masque de Ω
+    for i in range(masks1.shape[0]):
+        m1 = masks1[i]
+        v1 = vals1[i]
+        for j in range(masks2.shape[0]):
+            # Ω est neutre pour l'intersection : pas de ET (ni de conflit) possible
+            if m1 == full:
+                m = masks2[j]
+            elif masks2[j] == full:
+                m = m1
+            else:
+                m = m1 & masks2[j]
+            out_mass[m] += v1 * vals2[j]
+    return out_mass[0]
+
+
+def _combine_numpy(masks1, vals1, masks2, vals2, out_mass):
+    """
+    Même calcul que _combine, vectorisé avec NumPy : produit extérieur des masses,
+    ET binaire extérieur des masques, puis agrégation par masque (bincount)
+    """
+    prod = np.multiply.outer(vals1, vals2)
+    inter = np.bitwise_and.outer(masks1, masks2)
+    out_mass += np.bincount(inter.ravel(), weights=prod.ravel(), minlength=out_mass.shape[0])
+    return out_mass[0]
+
+
+try:
+    # Noyau compilé à l'avance (optionnel : cythonize -i _combine_cy.pyx), sans JIT au démarrage
+    from _combine_cy import combine as _combine_aot
+except ImportError:
+    _combine_aot = None
+
+if _combine_aot is not None:
+    _combine_kernel = _combine_aot
+elif NUMBA_AVAILABLE:
+    _combine_kernel = _combine
+else:
+    # Sans numba, la boucle Python de _combine serait la plus lente : passer par NumPy
+    _combine_kernel = _combine_numpy
+
+
+@lru_cache(maxsize=64)
+def _conjunctive_combination(mvec1_bytes, mvec2_bytes):
+    """
+    Combinaison conjonctive (non normalisée) de deux vecteurs de masses, mémoïsée par leur
+    contenu binaire. Retourne (masses combinées en lecture seule, conflit)
+    """
+    mvec1, mvec2 = np.frombuffer(mvec1_bytes), np.frombuffer(mvec2_bytes)
+    masks1 = np.flatnonzero(mvec1).astype(np.uint8)
+    masks2 = np.flatnonzero(mvec2).astype(np.uint8)
+    combined = np.zeros(mvec1.shape[0])
+    conflict = float(_combine_kernel(masks1, mvec1[masks1], masks2, mvec2[masks2], combined))
+    combined.flags.writeable = False
+    return combined, conflict
+
+
+# Libellé du coin supérieur gauche des matrices de combinaison
+CORNER_LABEL = 'm₁(A) \\ m₂(B)'
+
+# Cadre de discernement par défaut : {Surchauffe CPU, RAM Défaillante, Disque Dur, Problème Logiciel}
+DEFAULT_DISEASES = ('Surchauffe_CPU', 'RAM_Defaillante', 'Disque_Dur_Defaillant', 'Probleme_Logiciel')
+
+# Barres de progression précalculées (0 à 50 blocs pleins), tronquées à l'affichage
+_BARS = ['█' * i + '░' * (50 - i) for i in range(51)]
+
+# Gabarits des lignes répétées des tableaux (méthodes format liées, réutilisées à chaque ligne)
+_MASS_ROW = "m({label:47s}) = {mass:6.4f}   | {bar}".format
+_BELPL_ROW = "{name:<25} {bel:<10.4f} {pl:<10.4f} [{bel:.4f}, {pl:.4f}]".format
+_RANKING_ROW = "{name:>{width}} {bel:>8.6f} {pl:>13.6f} {unc:>12.6f}".format
+
+
+@dataclass
+class MassFunction:
+    """
+    Fonction de masse sur le cadre de discernement
+    mvec: vecteur dense des masses (longueur 2^|Ω|), indexé par le masque de bits de l'hypothèse
+    conflict: conflit K de la combinaison dont elle est issue (None pour une source)
+    """
+    name: str
+    mvec: np.ndarray
+    conflict: Optional[float] = None
+    # Bel et Pl des 2^|Ω| sous-ensembles, calculés à la première requête (mvec supposé non modifié)
+    bel: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    pl: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def focal(self):
+        """Masques des ensembles focaux (masse non nulle), par ordre croissant"""
+        return np.flatnonzero(self.mvec).astype(np.uint8)
+
+
+@lru_cache(maxsize=None)
+def _powerset_tuple(items):
+    """Ensemble des parties de `items` (tuple), matérialisé une seule fois par cadre"""
+    return tuple(frozenset(c) for c in
+                 chain.from_iterable(combinations(items, r) for r in range(len(items)+1)))
 
 
 class DempsterShaferDiagnosis:
@@ -26,18 +148,124 @@ class DempsterShaferDiagnosis:
     Système de diagnostic informatique utilisant la théorie de Dempster-Shafer
     """
     
-    def __init__(self):
-        # Cadre de discernement: {Surchauffe CPU, RAM Défaillante, Disque Dur, Problème Logiciel}
-        self.diseases = ['Surchauffe_CPU', 'RAM_Defaillante', 'Disque_Dur_Defaillant', 'Probleme_Logiciel']
+    # Dossiers de sortie déjà créés (partagé par toutes les instances)
+    _created_dirs = set()
+    
+    def __init__(self, verbose=True, diseases=DEFAULT_DISEASES):
+        """
+        Args:
+            verbose: affichage des matrices, fonctions de masse et Bel/Pl
+                     (False pour un usage programmatique)
+            diseases: problèmes du cadre de discernement Ω (au plus 8 : masques uint8)
+        
+        Raises:
+            ValueError: Si le cadre est vide, contient des doublons ou plus de 8 problèmes
+        """
+        if not 0 < len(set(diseases)) == len(diseases) <= 8:
+            raise ValueError(f"Cadre de discernement invalide (1 à 8 problèmes distincts) : {diseases}")
+        self.verbose = verbose
+        
+        # Cadre de discernement (DEFAULT_DISEASES par défaut)
+        self.diseases = list(diseases)
         self.frame = set(self.diseases)
         
-    def powerset(self, iterable):
-        """Génère l'ensemble des parties (powerset)"""
-        s = list(iterable)
-        return chain.from_iterable(combinations(s, r) for r in range(len(s)+1))
+        # Hypothèses usuelles partagées (évite de recréer les frozensets à chaque source)
+        self.OMEGA = frozenset(self.diseases)
+        self.SINGLETONS = {d: frozenset([d]) for d in self.diseases}
+        # Masque de bits de Ω (tous les bits levés), utilisable directement comme clé de masse
+        self.OMEGA_MASK = (1 << len(self.diseases)) - 1
+        
+        # Export PNG des matrices de combinaison (coûteux : rendu matplotlib)
+        self.export_png = False
+        self._fig = None  # Figure réutilisée par tous les exports (créée à la demande)
+        
+        # Dossiers de sortie (créés une seule fois, à la première écriture)
+        self.images_dir = Path('images')
+        self.results_dir = Path('resultats')
+        
+        self._all_subsets = _powerset_tuple(tuple(self.diseases))
+        
+        # Codage des hypothèses en masques de bits : bit i = problème i
+        # (|Ω| ≤ 8, donc les 2^|Ω| sous-ensembles tiennent dans un uint8)
+        self._bit = {d: 1 << i for i, d in enumerate(self.diseases)}
+        self._n_subsets = 1 << len(self.diseases)
+        self._subsets = [frozenset(d for d in self.diseases if mask & self._bit[d])
+                         for mask in range(self._n_subsets)]
+        self._all_masks = np.arange(self._n_subsets, dtype=np.uint8)
+        
+        # Matrice de croyance BM[A, B] = 1 si B ⊆ A, donc Bel = BM @ m pour les 16 sous-ensembles.
+        # Structure de Kronecker : BM_{i+1} = [[BM_i, 0], [BM_i, BM_i]] à partir de [[1]]
+        bm = np.ones((1, 1))
+        for _ in self.diseases:
+            bm = np.block([[bm, np.zeros_like(bm)], [bm, bm]])
+        self._BM = bm
+        # Matrice de plausibilité : Pl(A) = 1 - Bel(Ā)  ->  PL[A, B] = 1 si A ∩ B ≠ ∅
+        self._PL = 1.0 - self._BM[self.OMEGA_MASK ^ self._all_masks, :]
+        # Bitmaps des sous-ensembles (un bit par masque A, sur 2^|Ω| bits) :
+        # SUBMASK[B] = {A : A ⊆ B},  INTMASK[B] = {A : A ∩ B ≠ ∅}
+        self._submask = [sum(1 << a for a in range(self._n_subsets) if a & b == a)
+                         for b in range(self._n_subsets)]
+        self._intmask = [sum(1 << a for a in range(self._n_subsets) if a & b)
+                         for b in range(self._n_subsets)]
+        # Indices des singletons {i} = masque 1 << i, dans l'ordre de self.diseases
+        self._singletons = np.array([self._bit[d] for d in self.diseases])
+        
+        # Libellés d'affichage précalculés pour les 16 sous-ensembles (indexés par masque)
+        self._labels = [self._format_label(fs) for fs in self._subsets]
+        self._label_of = dict(zip(self._subsets, self._labels))
+        self._label_array = np.array(self._labels, dtype=object)
+        
+        # Passage masse -> commonalité : q(A) = Σ_{B ⊇ A} m(B), soit q = _to_q @ m (= BMᵀ @ m)
+        # et son inverse de Möbius m(A) = Σ_{B ⊇ A} (-1)^|B \ A| q(B)
+        a = self._all_masks[:, None]
+        b = self._all_masks[None, :]
+        parity = np.array([bin(mask).count("1") % 2 for mask in range(self._n_subsets)])
+        sign = np.where(parity[b ^ a] == 0, 1.0, -1.0)
+        self._to_q = self._BM.T.copy()
+        self._from_q = self._to_q * sign
+        
+    def __del__(self):
+        if getattr(self, '_fig', None) is not None:
+            import matplotlib.pyplot as plt
+            plt.close(self._fig)
+    
+    def _output_dir(self, path):
+        """Retourne le dossier de sortie, en le créant lors du premier appel"""
+        if path not in self._created_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(path)
+        return path
+    
+    def save_results(self, results, filename):
+        """
+        Écrit les résultats Bel/Pl (liste de dicts) dans un CSV du dossier de résultats
+        
+        Returns:
+            Le chemin du fichier écrit
+        """
+        path = self._output_dir(self.results_dir) / filename
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]), lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(results)
+        return path
+    
+    def powerset(self, iterable=None):
+        """Génère l'ensemble des parties (powerset), par défaut celui du cadre"""
+        if iterable is None:
+            return self._all_subsets
+        return _powerset_tuple(tuple(iterable))
     
     def format_hypothesis(self, hyp_set):
-        """Formate une hypothèse pour l'affichage"""
+        """Formate une hypothèse (ensemble ou masque de bits) pour l'affichage"""
+        if isinstance(hyp_set, (int, np.integer)):
+            return self._labels[hyp_set]
+        if isinstance(hyp_set, frozenset) and hyp_set in self._label_of:
+            return self._label_of[hyp_set]
+        return self._format_label(hyp_set)
+    
+    def _format_label(self, hyp_set):
+        """Construit le libellé d'une hypothèse (∅, Ω ou liste triée)"""
         if len(hyp_set) == 0:
             return "∅"
         elif len(hyp_set) == len(self.diseases):
@@ -45,201 +273,218 @@ class DempsterShaferDiagnosis:
         else:
             return "{" + ", ".join(sorted(hyp_set)) + "}"
     
+    def _encode(self, hyp):
+        """Convertit une hypothèse (ensemble de problèmes) en masque de bits"""
+        return reduce(or_, (self._bit[d] for d in hyp), 0)
+    
     def create_mass_function(self, name, masses):
         """
         Crée une fonction de masse
-        masses: dict avec clés = frozenset des hypothèses, valeurs = masse
+        masses: dict avec clés = frozenset des hypothèses (ou directement leur masque de bits),
+                valeurs = masse
         """
-        total = sum(masses.values())
-        if abs(total - 1.0) > 0.001:
-            raise ValueError(f"La somme des masses doit être 1.0, obtenu: {total}")
-        return {"name": name, "masses": masses}
+        mvec = np.zeros(self._n_subsets, dtype=np.float64)
+        for hyp, mass in masses.items():
+            mvec[self._hypothesis_mask(hyp)] += mass
+        
+        # Validation (supprimée avec python -O)
+        if __debug__:
+            total = math.fsum(mvec)
+            if not math.isclose(total, 1.0, abs_tol=1e-3):
+                raise ValueError(f"La somme des masses doit être 1.0, obtenu: {total}")
+        return MassFunction(name, mvec)
     
     def dempster_combination(self, mf1, mf2, show_matrix=True):
         """
         Règle de combinaison de Dempster pour combiner deux fonctions de masse
+        (les combinaisons déjà calculées pour les mêmes masses sont réutilisées)
         """
-        combined = {}
-        conflict = 0.0
+        # Combiner les masses : accumulation indexée par le masque de l'intersection (ET binaire),
+        # la case 0 (intersection vide) recevant le conflit
+        combined, conflict = _conjunctive_combination(mf1.mvec.tobytes(), mf2.mvec.tobytes())
+        
+        # Afficher (et/ou exporter) la matrice si demandé
+        if show_matrix and (self.verbose or self.export_png):
+            masks1, masks2 = mf1.focal, mf2.focal
+            vals1, vals2 = mf1.mvec[masks1], mf2.mvec[masks2]
+            
+            # Produits de toutes les paires de masses et intersections, libellés par indexation
+            matrix = np.multiply.outer(vals1, vals2)
+            inter = np.bitwise_and.outer(masks1, masks2)
+            intersection_matrix = self._label_array[inter]
+            if self.verbose:
+                sys.stdout.write(self.format_combination_matrix(mf1, mf2, masks1, masks2, matrix,
+                                                                intersection_matrix, conflict))
+            if self.export_png:
+                self._export_matrix_to_png(mf1, mf2, masks1, masks2, matrix, intersection_matrix,
+                                           conflict, inter == 0)
+        
+        # Normalisation par (1 - K) où K est le conflit (inutile si K = 0 : la case ∅
+        # est déjà nulle et le vecteur en cache, en lecture seule, peut être partagé)
+        if conflict >= 1.0:
+            raise ValueError("Conflit total! Les sources sont complètement contradictoires.")
+        if conflict > 0.0:
+            combined = combined / (1 - conflict)
+            combined[0] = 0.0
         
-        # Préparer les données pour la matrice
-        hyp1_list = list(mf1['masses'].keys())
-        hyp2_list = list(mf2['masses'].keys())
+        return MassFunction(f"{mf1.name} ⊕ {mf2.name}", combined, conflict)
+    
+    def combine_sources(self, mass_functions, show_matrix=False):
+        """
+        Combine plusieurs sources par applications successives de la règle de Dempster
+        (associative et commutative), en commençant par les sources ayant le moins
+        d'ensembles focaux pour limiter la taille des combinaisons intermédiaires
         
-        # Créer la matrice de combinaison
-        matrix = np.zeros((len(hyp1_list), len(hyp2_list)))
-        intersection_matrix = []
+        Args:
+            mass_functions: liste de fonctions de masse (au moins une)
+            show_matrix: afficher la matrice de chaque combinaison intermédiaire
         
-        # Pour chaque paire de masses
-        for i, hyp1 in enumerate(hyp1_list):
-            mass1 = mf1['masses'][hyp1]
-            row_intersections = []
-            
-            for j, hyp2 in enumerate(hyp2_list):
-                mass2 = mf2['masses'][hyp2]
-                
-                # Intersection des hypothèses
-                intersection = hyp1 & hyp2
-                product = mass1 * mass2
-                matrix[i, j] = product
-                
-                if len(intersection) == 0:
-                    # Conflit: hypothèses contradictoires
-                    conflict += product
-                    row_intersections.append("∅")
-                else:
-                    # Combiner les masses
-                    if intersection in combined:
-                        combined[intersection] += product
-                    else:
-                        combined[intersection] = product
-                    row_intersections.append(self.format_hypothesis(intersection))
-            
-            intersection_matrix.append(row_intersections)
+        Returns:
+            La fonction de masse combinée
+        """
+        ordered = sorted(mass_functions, key=lambda mf: len(mf.focal))
+        return reduce(lambda acc, mf: self.dempster_combination(acc, mf, show_matrix), ordered)
+    
+    def combine_all(self, mass_functions, tol=1e-12):
+        """
+        Combine en une fois plusieurs fonctions de masse par la règle de Dempster,
+        dans le domaine des commonalités où elle devient un produit point à point :
+        q_{1⊕...⊕N}(A) ∝ q_1(A)·...·q_N(A)
         
-        # Afficher la matrice si demandé
-        if show_matrix:
-            self._print_combination_matrix(mf1, mf2, hyp1_list, hyp2_list, matrix, intersection_matrix, conflict)
+        Args:
+            mass_functions: liste de fonctions de masse (au moins une)
+            tol: masses inférieures à ce seuil (erreurs d'arrondi) considérées nulles
         
-        # Normalisation par (1 - K) où K est le conflit
-        if conflict < 1.0:
-            for hyp in combined:
-                combined[hyp] /= (1 - conflict)
-        else:
+        Returns:
+            La fonction de masse combinée, le conflit K étant celui de la combinaison globale
+        """
+        q = np.ones(self._n_subsets)
+        for mf in mass_functions:
+            q *= self._to_q @ mf.mvec
+        
+        # Combinaison conjonctive non normalisée : la masse de ∅ est le conflit
+        conj = self._from_q @ q
+        conj[np.abs(conj) < tol] = 0.0
+        conflict = float(conj[0])
+        if conflict >= 1.0 - tol:
             raise ValueError("Conflit total! Les sources sont complètement contradictoires.")
         
-        return {
-            "name": f"{mf1['name']} ⊕ {mf2['name']}",
-            "masses": combined,
-            "conflict": conflict
-        }
+        if conflict > 0.0:
+            conj[0] = 0.0
+            conj /= 1 - conflict
+        return MassFunction(" ⊕ ".join(mf.name for mf in mass_functions), conj, conflict)
     
-    def _print_combination_matrix(self, mf1, mf2, hyp1_list, hyp2_list, matrix, intersection_matrix, conflict):
-        """Affiche la matrice de combinaison de Dempster"""
-        print(f"\n{'='*80}")
-        print(f"MATRICE DE COMBINAISON: {mf1['name']} ⊕ {mf2['name']}")
-        print(f"{'='*80}")
+    def format_combination_matrix(self, mf1, mf2, masks1, masks2, matrix, intersection_matrix, conflict):
+        """Construit le texte de la matrice de combinaison de Dempster (lignes/colonnes: masques focaux)"""
+        out = [f"\n{'='*80}",
+               f"MATRICE DE COMBINAISON: {mf1.name} ⊕ {mf2.name}",
+               f"{'='*80}"]
         
         # En-têtes des colonnes
-        col_headers = [self.format_hypothesis(h) for h in hyp2_list]
-        col_masses = [f"m₂={mf2['masses'][h]:.3f}" for h in hyp2_list]
+        col_headers = [self._labels[m] for m in masks2]
+        col_masses = [f"m₂={mf2.mvec[m]:.3f}" for m in masks2]
         
         # Afficher les masses de la source 2
-        print(f"\n{mf2['name']} (Source 2):")
-        for h, m in zip(hyp2_list, col_masses):
-            print(f"  {self.format_hypothesis(h):40s} {m}")
+        out.append(f"\n{mf2.name} (Source 2):")
+        for h, m in zip(col_headers, col_masses):
+            out.append(f"  {h:40s} {m}")
         
-        print(f"\n{mf1['name']} (Source 1) × {mf2['name']} (Source 2):")
-        print(f"{'-'*80}")
+        out.append(f"\n{mf1.name} (Source 1) × {mf2.name} (Source 2):")
+        out.append(f"{'-'*80}")
         
         # Calculer les largeurs de colonnes
-        col_widths = [max(len(col_headers[j]), 12) for j in range(len(hyp2_list))]
+        col_widths = [max(len(h), 12) for h in col_headers]
+        
+        def format_row(label, width, cells):
+            """Construit une ligne: libellé puis cellules centrées, séparées par ' | '"""
+            centered = [f"{c:^{w}s}" for c, w in zip(cells, col_widths)]
+            return f"{label:{width}s} | " + " | ".join(centered) + " | "
         
         # Ligne d'en-tête
-        header = f"{'m₁(A) \\ m₂(B)':25s} | "
-        for j, h in enumerate(hyp2_list):
-            header += f"{self.format_hypothesis(h):^{col_widths[j]}s} | "
-        print(header)
-        print("-" * len(header))
-        
-        # Lignes de la matrice
-        for i, hyp1 in enumerate(hyp1_list):
-            mass1 = mf1['masses'][hyp1]
-            row = f"{self.format_hypothesis(hyp1):23s} | "
-            
-            for j in range(len(hyp2_list)):
-                cell_value = f"{matrix[i,j]:.4f}"
-                row += f"{cell_value:^{col_widths[j]}s} | "
+        header = format_row(CORNER_LABEL, 25, col_headers)
+        rule = "-" * len(header)
+        out += [header, rule]
+        
+        # Lignes de la matrice (toutes les valeurs formatées en une passe)
+        cell_values = np.char.mod('%.4f', matrix)
+        for i, m1 in enumerate(masks1):
+            out.append(format_row(self._labels[m1], 23, cell_values[i]))
             
-            print(row)
-            
-            # Ligne avec les intersections
-            intersection_row = f"{'→ A∩B':23s} | "
-            for j in range(len(hyp2_list)):
-                inter = intersection_matrix[i][j]
-                # Tronquer si trop long
-                if len(inter) > col_widths[j]:
-                    inter = inter[:col_widths[j]-2] + ".."
-                intersection_row += f"{inter:^{col_widths[j]}s} | "
-            print(intersection_row)
-            print("-" * len(header))
-        
-        print(f"\n📊 RÉSUMÉ DU CALCUL:")
-        print(f"  • Conflit total (K) = {conflict:.4f} ({conflict*100:.1f}%)")
-        print(f"    → Masse attribuée à l'ensemble vide (contradiction)")
-        print(f"  • Normalisation = 1/(1-K) = 1/{1-conflict:.4f} = {1/(1-conflict):.4f}")
-        print(f"    → Les masses non-conflictuelles sont divisées par ce facteur")
-        print(f"{'='*80}\n")
-        
-        # Exporter la matrice en PNG
-        self._export_matrix_to_png(mf1, mf2, hyp1_list, hyp2_list, matrix, intersection_matrix, conflict)
-    
-    def _export_matrix_to_png(self, mf1, mf2, hyp1_list, hyp2_list, matrix, intersection_matrix, conflict):
-        """Exporte la matrice de combinaison en image PNG"""
-        
-        # Créer le dossier de sortie
-        os.makedirs('images', exist_ok=True)
-        
-        # Nom du fichier
-        filename = f"images/matrice_{mf1['name'].replace(' ', '_')}_{mf2['name'].replace(' ', '_')}.png"
-        
-        # Créer la figure
-        fig, ax = plt.subplots(figsize=(14, max(8, len(hyp1_list) * 1.5)))
+            # Ligne avec les intersections (tronquées si trop longues)
+            inters = [inter if len(inter) <= w else inter[:w-2] + ".."
+                      for inter, w in zip(intersection_matrix[i], col_widths)]
+            out.append(format_row('→ A∩B', 23, inters))
+            out.append(rule)
+        
+        out += [f"\n📊 RÉSUMÉ DU CALCUL:",
+                f"  • Conflit total (K) = {conflict:.4f} ({conflict*100:.1f}%)",
+                f"    → Masse attribuée à l'ensemble vide (contradiction)",
+                f"  • Normalisation = 1/(1-K) = 1/{1-conflict:.4f} = {1/(1-conflict):.4f}",
+                f"    → Les masses non-conflictuelles sont divisées par ce facteur",
+                f"{'='*80}\n"]
+        return "\n".join(out) + "\n"
+    
+    def _export_matrix_to_png(self, mf1, mf2, masks1, masks2, matrix, intersection_matrix,
+                              conflict, conflict_mask):
+        """
+        Exporte la matrice de combinaison en image PNG
+        conflict_mask: tableau booléen, vrai là où l'intersection est vide (∅)
+        """
+        import matplotlib.pyplot as plt
+        
+        # Nom du fichier (le dossier de sortie est créé au premier export)
+        filename = (self._output_dir(self.images_dir) /
+                    f"matrice_{mf1.name.replace(' ', '_')}_{mf2.name.replace(' ', '_')}.png")
+        
+        # Réutiliser la figure des exports précédents (marges fixes : pas de passe 'tight')
+        if self._fig is None:
+            self._fig, self._ax = plt.subplots()
+            self._fig.subplots_adjust(left=0.02, right=0.98, top=0.98, bottom=0.1)
+        fig, ax = self._fig, self._ax
+        ax.clear()
+        for text in list(fig.texts):
+            text.remove()
+        fig.set_size_inches(14, max(8, len(masks1) * 1.5))
         ax.axis('tight')
         ax.axis('off')
         
-        # Préparer les données du tableau
-        col_headers = [self.format_hypothesis(h) for h in hyp2_list]
-        row_headers = [self.format_hypothesis(h) for h in hyp1_list]
-        
         # Créer les données du tableau
         table_data = []
         
         # En-tête avec les colonnes
-        header_row = ['m₁(A) \\ m₂(B)'] + [f"{h}\nm₂={mf2['masses'][hyp2_list[j]]:.3f}" 
-                                             for j, h in enumerate(col_headers)]
+        header_row = [CORNER_LABEL] + [f"{self._labels[m]}\nm₂={mf2.mvec[m]:.3f}" for m in masks2]
         table_data.append(header_row)
         
         # Lignes de données
-        for i, hyp1 in enumerate(hyp1_list):
-            mass1 = mf1['masses'][hyp1]
-            row = [f"{row_headers[i]}\nm₁={mass1:.3f}"]
+        for i, m1 in enumerate(masks1):
+            row = [f"{self._labels[m1]}\nm₁={mf1.mvec[m1]:.3f}"]
             
-            for j in range(len(hyp2_list)):
+            for j in range(len(masks2)):
                 cell_text = f"{matrix[i,j]:.4f}\n→ {intersection_matrix[i][j]}"
                 row.append(cell_text)
             
             table_data.append(row)
         
+        # Couleurs de fond de toutes les cellules, fixées en une fois à la création du tableau
+        colours = np.full((len(table_data), len(header_row)), '#E8F5E9', dtype=object)  # Vert clair: non-conflit
+        colours[1:, 1:][conflict_mask] = '#FFE6E6'  # Rouge clair pour conflit (∅)
+        colours[0, :] = '#4472C4'                    # En-tête
+        colours[1:, 0] = '#D9E1F2'                   # Première colonne
+        
         # Créer le tableau
-        table = ax.table(cellText=table_data, cellLoc='center', loc='center',
-                        bbox=[0, 0, 1, 1])
+        table = ax.table(cellText=table_data, cellColours=colours.tolist(), cellLoc='center',
+                        loc='center', bbox=[0, 0, 1, 1])
         
         # Styliser le tableau
         table.auto_set_font_size(False)
         table.set_fontsize(9)
         table.scale(1, 2.5)
         
-        # Colorer l'en-tête
+        # Texte en gras pour l'en-tête et la première colonne
         for i in range(len(header_row)):
-            cell = table[(0, i)]
-            cell.set_facecolor('#4472C4')
-            cell.set_text_props(weight='bold', color='white')
-        
-        # Colorer la première colonne
+            table[(0, i)].set_text_props(weight='bold', color='white')
         for i in range(1, len(table_data)):
-            cell = table[(i, 0)]
-            cell.set_facecolor('#D9E1F2')
-            cell.set_text_props(weight='bold')
-        
-        # Colorer les cellules avec conflit (∅)
-        for i in range(1, len(table_data)):
-            for j in range(1, len(header_row)):
-                cell = table[(i, j)]
-                if '∅' in intersection_matrix[i-1][j-1]:
-                    cell.set_facecolor('#FFE6E6')  # Rouge clair pour conflit
-                else:
-                    cell.set_facecolor('#E8F5E9')  # Vert clair pour non-conflit
+            table[(i, 0)].set_text_props(weight='bold')
         
         # Ajouter le résumé en bas (pas de titre principal)
         summary_text = (f"Conflit total (K) = {conflict:.4f} ({conflict*100:.1f}%)\n"
@@ -248,98 +493,204 @@ class DempsterShaferDiagnosis:
                 bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
         
         # Sauvegarder
-        plt.savefig(filename, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        print(f"  ✓ Matrice exportée: {filename}")
-    
-    def calculate_belief(self, mass_function, hypothesis):
+        fig.savefig(filename, dpi=120, facecolor='white')
+        
+        if self.verbose:
+            print(f"  ✓ Matrice exportée: {filename}")
+    
+    def _hypothesis_mask(self, hypothesis):
+        """Masque de bits d'une hypothèse (masque, problème seul ou collection de problèmes)"""
+        if isinstance(hypothesis, (int, np.integer)):
+            return int(hypothesis)
+        if isinstance(hypothesis, (list, set, frozenset, tuple)):
+            return self._encode(hypothesis)
+        return self._bit[hypothesis]
+    
+    def _bel_pl(self, mass_function):
+        """Tables Bel/Pl (indexées par masque) de la fonction de masse, calculées une seule fois"""
+        if mass_function.bel is None:
+            mass_function.bel = self._BM @ mass_function.mvec
+            mass_function.pl = self._PL @ mass_function.mvec
+        return mass_function.bel, mass_function.pl
+    
+    @staticmethod
+    def _masked_sum(mvec, bitmap):
+        """Somme des mvec[A] pour les bits A levés dans bitmap (extraction du bit de poids faible)"""
+        total = 0.0
+        while bitmap:
+            low = bitmap & -bitmap
+            total += mvec[low.bit_length() - 1]
+            bitmap ^= low
+        return total
+    
+    def _bel(self, mass_function, h):
         """
-        Calcule Bel(A) = somme des masses de tous les sous-ensembles de A
+        Bel(A) pour A donné directement par son masque de bits h
+        (requête isolée : parcours des bits de SUBMASK[A] si les tables ne sont pas encore calculées)
         """
-        belief = 0.0
-        hyp_set = frozenset(hypothesis) if isinstance(hypothesis, (list, set)) else frozenset([hypothesis])
-        
-        for focal_set, mass in mass_function['masses'].items():
-            if focal_set.issubset(hyp_set):
-                belief += mass
-        
-        return belief
+        if mass_function.bel is not None:
+            return float(mass_function.bel[h])
+        return self._masked_sum(mass_function.mvec.tolist(), self._submask[h])
     
-    def calculate_plausibility(self, mass_function, hypothesis):
+    def _pl(self, mass_function, h):
         """
-        Calcule Pl(A) = somme des masses qui intersectent A
+        Pl(A) pour A donné directement par son masque de bits h
+        (requête isolée : parcours des bits de INTMASK[A] si les tables ne sont pas encore calculées)
         """
-        plausibility = 0.0
-        hyp_set = frozenset(hypothesis) if isinstance(hypothesis, (list, set)) else frozenset([hypothesis])
-        
-        for focal_set, mass in mass_function['masses'].items():
-            if len(focal_set & hyp_set) > 0:
-                plausibility += mass
-        
-        return plausibility
+        if mass_function.pl is not None:
+            return float(mass_function.pl[h])
+        return self._masked_sum(mass_function.mvec.tolist(), self._intmask[h])
     
-    def print_mass_function(self, mass_function):
-        """Affiche une fonction de masse de manière lisible"""
-        print(f"\n{'='*70}")
-        print(f"Source: {mass_function['name']}")
-        print(f"{'='*70}")
-        
-        # Trier par masse décroissante
-        sorted_masses = sorted(mass_function['masses'].items(), 
+    def calculate_belief(self, mass_function, hypothesis):
+        """Calcule Bel(A) = somme des masses de tous les sous-ensembles de A"""
+        return self._bel(mass_function, self._hypothesis_mask(hypothesis))
+    
+    def calculate_plausibility(self, mass_function, hypothesis):
+        """Calcule Pl(A) = somme des masses qui intersectent A"""
+        return self._pl(mass_function, self._hypothesis_mask(hypothesis))
+    
+    def format_mass_function(self, mass_function):
+        """Construit le texte d'affichage d'une fonction de masse"""
+        out = [f"\n{'='*70}",
+               f"Source: {mass_function.name}",
+               f"{'='*70}"]
+        
+        # Trier par masse décroissante (tri stable : à masse égale, ordre des masques)
+        focal = mass_function.focal
+        sorted_masses = sorted(zip(focal.tolist(), mass_function.mvec[focal].tolist()),
                               key=lambda x: x[1], reverse=True)
         
         # Créer une matrice visuelle
-        print(f"\n{'Hypothèse':50s} | {'Masse':10s} | {'Visuel':20s}")
-        print(f"{'-'*85}")
+        out.append(f"\n{'Hypothèse':50s} | {'Masse':10s} | {'Visuel':20s}")
+        out.append(f"{'-'*85}")
         
         for hyp, mass in sorted_masses:
-            # Barre de progression
-            bar_length = int(mass * 50)
-            bar = '█' * bar_length + '░' * (50 - bar_length)
-            bar_short = bar[:20]  # Limiter pour l'affichage
+            # Barre de progression (limitée à 20 caractères pour l'affichage)
+            bar_short = _BARS[int(mass * 50)][:20]
             
-            print(f"m({self.format_hypothesis(hyp):47s}) = {mass:6.4f}   | {bar_short}")
+            out.append(_MASS_ROW(label=self._labels[hyp], mass=mass, bar=bar_short))
         
-        if 'conflict' in mass_function:
-            print(f"\n  ⚠️  Conflit détecté: {mass_function['conflict']:.4f} ({mass_function['conflict']*100:.1f}%)")
+        if mass_function.conflict is not None:
+            out.append(f"\n  ⚠️  Conflit détecté: {mass_function.conflict:.4f} ({mass_function.conflict*100:.1f}%)")
         
         # Tableau récapitulatif des masses
-        print(f"\n📊 TABLEAU RÉCAPITULATIF:")
-        data = []
-        for hyp, mass in sorted_masses:
-            data.append({
-                'Hypothèse': self.format_hypothesis(hyp),
-                'Masse': f"{mass:.4f}",
-                'Pourcentage': f"{mass*100:.2f}%"
-            })
-        
-        df = pd.DataFrame(data)
-        print(df.to_string(index=False))
-        print(f"{'='*70}")
+        out.append(f"\n📊 TABLEAU RÉCAPITULATIF:")
+        headers = ('Hypothèse', 'Masse', 'Pourcentage')
+        rows = [(self._labels[hyp], f"{mass:.4f}", f"{mass*100:.2f}%")
+                for hyp, mass in sorted_masses]
+        
+        # Colonnes alignées à droite, séparées par un espace
+        widths = [max(len(cell) for cell in column) for column in zip(headers, *rows)]
+        for row in (headers, *rows):
+            out.append(" ".join(cell.rjust(w) for cell, w in zip(row, widths)))
+        out.append(f"{'='*70}")
+        return "\n".join(out) + "\n"
     
-    def print_belief_plausibility(self, mass_function):
-        """Affiche Bel et Pl pour chaque problème"""
-        print(f"\n{'='*70}")
-        print(f"Belief (Bel) et Plausibility (Pl) pour: {mass_function['name']}")
-        print(f"{'='*70}")
-        print(f"{'Problème':<25} {'Bel':<10} {'Pl':<10} {'Intervalle':<20}")
-        print(f"{'-'*70}")
+    def print_mass_function(self, mass_function):
+        """Affiche une fonction de masse de manière lisible (une seule écriture)"""
+        if self.verbose:
+            sys.stdout.write(self.format_mass_function(mass_function))
+    
+    def belief_plausibility(self, mass_function):
+        """Bel, Pl et incertitude de chaque problème (liste de dicts, dans l'ordre de self.diseases)"""
+        # Bel et Pl des singletons, lus dans les tables de la fonction de masse
+        bel, pl = self._bel_pl(mass_function)
+        bels, pls = bel[self._singletons], pl[self._singletons]
         
         results = []
-        for disease in self.diseases:
-            bel = self.calculate_belief(mass_function, [disease])
-            pl = self.calculate_plausibility(mass_function, [disease])
-            display_name = disease.replace('_', ' ')
-            print(f"{display_name:<25} {bel:<10.4f} {pl:<10.4f} [{bel:.4f}, {pl:.4f}]")
+        for disease, bel, pl in zip(self.diseases, bels.tolist(), pls.tolist()):
             results.append({
-                'Probleme': display_name,
+                'Probleme': disease.replace('_', ' '),
                 'Belief': bel,
                 'Plausibility': pl,
                 'Uncertainty': pl - bel
             })
-        
         return results
+    
+    def argmax_belief(self, mass_function):
+        """
+        Indice (dans self.diseases) du problème de croyance maximale
+        (Bel({x}) = m({x}) : lecture directe des masses des singletons, sans tables Bel/Pl)
+        """
+        return int(np.argmax(mass_function.mvec[self._singletons]))
+    
+    def belief_order(self, mass_function):
+        """
+        Indices des problèmes (dans self.diseases) par croyance décroissante
+        (tri stable sur la table Bel : à croyance égale, ordre de self.diseases)
+        """
+        bel, _ = self._bel_pl(mass_function)
+        return np.argsort(-bel[self._singletons], kind='stable')
+    
+    def format_belief_plausibility(self, mass_function, results):
+        """Construit le tableau Bel/Pl d'affichage à partir des résultats de belief_plausibility"""
+        out = [f"\n{'='*70}",
+               f"Belief (Bel) et Plausibility (Pl) pour: {mass_function.name}",
+               f"{'='*70}",
+               f"{'Problème':<25} {'Bel':<10} {'Pl':<10} {'Intervalle':<20}",
+               f"{'-'*70}"]
+        out += [_BELPL_ROW(name=r['Probleme'], bel=r['Belief'], pl=r['Plausibility'])
+                for r in results]
+        return "\n".join(out) + "\n"
+    
+    def format_ranking(self, results):
+        """Tableau texte du classement (Probleme, Belief, Plausibility, Uncertainty), noms alignés à droite"""
+        width = max(len('Probleme'), *(len(r['Probleme']) for r in results))
+        out = [f"{'Probleme':>{width}} {'Belief':>8} {'Plausibility':>13} {'Uncertainty':>12}"]
+        out += [_RANKING_ROW(name=r['Probleme'], width=width, bel=r['Belief'],
+                             pl=r['Plausibility'], unc=r['Uncertainty'])
+                for r in results]
+        return "\n".join(out)
+    
+    def print_belief_plausibility(self, mass_function):
+        """Affiche Bel et Pl pour chaque problème (et les retourne, même si verbose=False)"""
+        results = self.belief_plausibility(mass_function)
+        if self.verbose:
+            sys.stdout.write(self.format_belief_plausibility(mass_function, results))
+        return results
+
+
+# Recommandations techniques par diagnostic retenu (croyance > RECOMMENDATION_BELIEF)
+RECOMMENDATION_BELIEF = 0.5
+RECOMMENDATIONS = {
+    'Surchauffe CPU': """
+✓ Diagnostic: SURCHAUFFE CPU - Haute confiance
+✓ Actions correctives recommandées:
+  1. Nettoyage complet du boîtier (enlever la poussière)
+  2. Remplacement de la pâte thermique du CPU
+  3. Vérification/remplacement du ventilateur CPU si nécessaire
+  4. Amélioration du flux d'air (ventilateurs supplémentaires)
+  5. Vérification des profils de ventilation dans le BIOS
+  
+✓ Coût estimé: 20-50€ (pâte thermique + nettoyage)
+✓ Temps d'intervention: 1-2 heures
+✓ Niveau de difficulté: Moyen (tutoriels disponibles en ligne)
+
+✓ Suivi:
+  - Tester les températures après intervention
+  - Monitoring sur 24-48h
+  - Si problème persiste: vérifier le montage du ventirad
+        """,
+    'RAM Defaillante': """
+✓ Diagnostic: RAM DÉFAILLANTE - Haute confiance
+✓ Actions correctives:
+  - Remplacer les modules RAM défectueux
+  - Tester avec d'autres modules pour confirmer
+  - Vérifier la compatibilité des barrettes
+        """,
+}
+
+# Recommandation par défaut lorsque l'incertitude dépasse HIGH_UNCERTAINTY
+HIGH_UNCERTAINTY = 0.4
+HIGH_UNCERTAINTY_RECOMMENDATION = """
+⚠ ATTENTION: Niveau d'incertitude élevé!
+✓ Recommandations:
+  - Effectuer des tests supplémentaires
+  - Test S.M.A.R.T du disque dur (CrystalDiskInfo)
+  - Vérifier les logs système Windows (Event Viewer)
+  - Test de stress CPU (Prime95) sous monitoring
+  - Réévaluation après premiers correctifs
+        """
 
 
 def main():
@@ -352,6 +703,7 @@ def main():
     print("=" + "="*68 + "=\n")
     
     ds = DempsterShaferDiagnosis()
+    ds.export_png = True
     
     print("="*70)
     print("SITUATION TECHNIQUE")
@@ -395,10 +747,10 @@ Observations du technicien:
     source1 = ds.create_mass_function(
         "Inspection Visuelle",
         {
-            frozenset(['Surchauffe_CPU']): 0.55,                              # Forte suspicion
+            ds.SINGLETONS['Surchauffe_CPU']: 0.55,                              # Forte suspicion
             frozenset(['Surchauffe_CPU', 'Disque_Dur_Defaillant']): 0.20,   # Possible combinaison
-            frozenset(['Probleme_Logiciel']): 0.05,                          # Peu probable
-            frozenset(ds.diseases): 0.20                                      # Incertitude
+            ds.SINGLETONS['Probleme_Logiciel']: 0.05,                          # Peu probable
+            ds.OMEGA: 0.20                                                    # Incertitude
         }
     )
     ds.print_mass_function(source1)
@@ -425,9 +777,9 @@ Interprétation:
     source2 = ds.create_mass_function(
         "Monitoring Température",
         {
-            frozenset(['Surchauffe_CPU']): 0.85,                           # Très forte évidence
+            ds.SINGLETONS['Surchauffe_CPU']: 0.85,                           # Très forte évidence
             frozenset(['RAM_Defaillante', 'Disque_Dur_Defaillant']): 0.05, # Peu probable
-            frozenset(ds.diseases): 0.10                                    # Petite incertitude
+            ds.OMEGA: 0.10                                                  # Petite incertitude
         }
     )
     ds.print_mass_function(source2)
@@ -466,8 +818,8 @@ Interprétation:
         "Test MemTest86",
         {
             frozenset(['Surchauffe_CPU', 'Disque_Dur_Defaillant', 'Probleme_Logiciel']): 0.75,  # Pas la RAM
-            frozenset(['RAM_Defaillante']): 0.05,                                                 # Très peu probable
-            frozenset(ds.diseases): 0.20                                                          # Incertitude du test
+            ds.SINGLETONS['RAM_Defaillante']: 0.05,                                                 # Très peu probable
+            ds.OMEGA: 0.20                                                                        # Incertitude du test
         }
     )
     ds.print_mass_function(source3)
@@ -491,13 +843,11 @@ Interprétation:
     print("="*70)
     
     # Trouver le diagnostic le plus probable
-    df = pd.DataFrame(final_results)
-    df = df.sort_values('Belief', ascending=False)
+    best_diagnosis = final_results[ds.argmax_belief(final_combined)]
+    sorted_results = [final_results[i] for i in ds.belief_order(final_combined)]
     
     print("\nClassement par croyance (Belief):")
-    print(df.to_string(index=False))
-    
-    best_diagnosis = df.iloc[0]
+    print(ds.format_ranking(sorted_results))
     
     print(f"\n{'='*70}")
     print(f"DIAGNOSTIC RECOMMANDÉ: {best_diagnosis['Probleme']}")
@@ -510,46 +860,16 @@ Interprétation:
     print("RECOMMANDATIONS TECHNIQUES")
     print(f"{'='*70}")
     
-    if best_diagnosis['Probleme'] == 'Surchauffe CPU' and best_diagnosis['Belief'] > 0.5:
-        print("""
-✓ Diagnostic: SURCHAUFFE CPU - Haute confiance
-✓ Actions correctives recommandées:
-  1. Nettoyage complet du boîtier (enlever la poussière)
-  2. Remplacement de la pâte thermique du CPU
-  3. Vérification/remplacement du ventilateur CPU si nécessaire
-  4. Amélioration du flux d'air (ventilateurs supplémentaires)
-  5. Vérification des profils de ventilation dans le BIOS
-  
-✓ Coût estimé: 20-50€ (pâte thermique + nettoyage)
-✓ Temps d'intervention: 1-2 heures
-✓ Niveau de difficulté: Moyen (tutoriels disponibles en ligne)
-
-✓ Suivi:
-  - Tester les températures après intervention
-  - Monitoring sur 24-48h
-  - Si problème persiste: vérifier le montage du ventirad
-        """)
-    elif best_diagnosis['Probleme'] == 'RAM Defaillante' and best_diagnosis['Belief'] > 0.5:
-        print("""
-✓ Diagnostic: RAM DÉFAILLANTE - Haute confiance
-✓ Actions correctives:
-  - Remplacer les modules RAM défectueux
-  - Tester avec d'autres modules pour confirmer
-  - Vérifier la compatibilité des barrettes
-        """)
-    elif best_diagnosis['Uncertainty'] > 0.4:
-        print("""
-⚠ ATTENTION: Niveau d'incertitude élevé!
-✓ Recommandations:
-  - Effectuer des tests supplémentaires
-  - Test S.M.A.R.T du disque dur (CrystalDiskInfo)
-  - Vérifier les logs système Windows (Event Viewer)
-  - Test de stress CPU (Prime95) sous monitoring
-  - Réévaluation après premiers correctifs
-        """)
+    recommendation = None
+    if best_diagnosis['Belief'] > RECOMMENDATION_BELIEF:
+        recommendation = RECOMMENDATIONS.get(best_diagnosis['Probleme'])
+    if recommendation is None and best_diagnosis['Uncertainty'] > HIGH_UNCERTAINTY:
+        recommendation = HIGH_UNCERTAINTY_RECOMMENDATION
+    if recommendation is not None:
+        print(recommendation)
     
     # Sauvegarder les résultats
-    df.to_csv('resultats/diagnostic_results.csv', index=False)
+    ds.save_results(sorted_results, 'diagnostic_results.csv')
     print(f"\n{'='*70}")
     print("✓ Résultats sauvegardés dans: BeliefFunctions/resultats/diagnostic_results.csv")
     print(f"{'='*70}\n")
@@ -566,20 +886,20 @@ Interprétation:
 #     source3_errors = ds.create_mass_function(
 #         "Test MemTest86 (AVEC ERREURS)",
 #         {
-#             frozenset(['RAM_Defaillante']): 0.90,      # Forte évidence pour RAM défaillante
-#             frozenset(ds.diseases): 0.10                # Petite incertitude
+#             ds.SINGLETONS['RAM_Defaillante']: 0.90,      # Forte évidence pour RAM défaillante
+#             ds.OMEGA: 0.10                              # Petite incertitude
 #         }
 #     )
     
-#     combined_alt1 = ds.dempster_combination(source1, source2)
-#     final_alt = ds.dempster_combination(combined_alt1, source3_errors)
+#     # Seule la source 3 change : réutiliser la combinaison Inspection ⊕ Monitoring
+#     final_alt = ds.dempster_combination(combined1, source3_errors)
     
 #     ds.print_mass_function(final_alt)
 #     alt_results = ds.print_belief_plausibility(final_alt)
     
-#     df_alt = pd.DataFrame(alt_results).sort_values('Belief', ascending=False)
-#     print(f"\nNouveau diagnostic: {df_alt.iloc[0]['Probleme']}")
-#     print(f"Croyance: {df_alt.iloc[0]['Belief']:.4f} ({df_alt.iloc[0]['Belief']*100:.1f}%)")
+#     best_alt = alt_results[ds.argmax_belief(final_alt)]
+#     print(f"\nNouveau diagnostic: {best_alt['Probleme']}")
+#     print(f"Croyance: {best_alt['Belief']:.4f} ({best_alt['Belief']*100:.1f}%)")
     
 #     print("\n" + "="*70)
 #     print("CONCLUSION")
@@ -0,0 +1,48 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, initializedcheck=False
+"""
+Noyau de combinaison conjonctive compilé à l'avance (Cython), pour les exécutions ponctuelles
+où la compilation JIT de numba n'est pas souhaitable. Même contrat que _combine de
+RealWorldExample.py ; compilation (optionnelle) :
+
+    cythonize -i _combine_cy.pyx
+"""
+
+
+def combine(const unsigned char[::1] masks1, const double[::1] vals1,
+            const unsigned char[::1] masks2, const double[::1] vals2,
+            double[::1] out_mass):
+    """
+    Accumule dans out_mass (indexé par masque) les produits des masses de chaque paire
+    d'ensembles focaux ; out_mass[0] reçoit le conflit, qui est retourné
+    """
+    cdef Py_ssize_t n = out_mass.shape[0]
+    if n > 256:
+        raise ValueError(f"Cadre trop grand pour des masques uint8 : {n} sous-ensembles")
+
+    # Accumulateur sur la pile (2^|Ω| ≤ 256 cases) : aucun objet Python dans la boucle
+    cdef double acc[256]
+    cdef Py_ssize_t i, j, k
+    cdef unsigned char m1, m2, m
+    cdef unsigned char full = <unsigned char>(n - 1)  # masque de Ω
+    cdef double v1
+
+    for k in range(n):
+        acc[k] = 0.0
+
+    for i in range(masks1.shape[0]):
+        m1 = masks1[i]
+        v1 = vals1[i]
+        for j in range(masks2.shape[0]):
+            # Ω est neutre pour l'intersection : pas de ET (ni de conflit) possible
+            m2 = masks2[j]
+            if m1 == full:
+                m = m2
+            elif m2 == full:
+                m = m1
+            else:
+                m = m1 & m2
+            acc[m] += v1 * vals2[j]
+
+    for k in range(n):
+        out_mass[k] += acc[k]
+    return out_mass[0]
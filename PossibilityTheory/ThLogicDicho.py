@@ -1,3 +1,5 @@
+import atexit
+from functools import lru_cache
 from pysat.solvers import Glucose4
 
 # a=1, b=2, c=3, d=4, e=5, f=6
@@ -17,34 +19,70 @@ strata = [
     {"weight": 0.14, "clauses": [[4]]}
 ]
 
+# 2. Load the whole base once into a persistent solver (incremental solving).
+# Each stratum i gets a selector variable s_i: assuming -s_i activates the stratum,
+# assuming s_i disables it. Clauses repeated across strata (e.g. [1, -2, 4, 5]) are
+# stored only once, as C OR c_k with their own selector c_k, and each stratum i
+# containing clause k activates it through the binary clause (s_i OR -c_k).
+# The clause database and learned clauses are then reused across every SAT call.
+n_vars = max(abs(lit) for stratum in strata for clause in stratum["clauses"] for lit in clause)
+selectors = [n_vars + 1 + i for i in range(len(strata))]
+clause_selectors = {}
+links = []
+for s_i, stratum in zip(selectors, strata):
+    for clause in stratum["clauses"]:
+        key = tuple(sorted(clause))
+        if key not in clause_selectors:
+            clause_selectors[key] = n_vars + len(strata) + 1 + len(clause_selectors)
+        links.append([s_i, -clause_selectors[key]])
+
+solver = Glucose4()
+# Shortest clauses first (e.g. [-2, 3] before [1, -2, 4, 5]) for earlier unit propagation
+for key in sorted(clause_selectors, key=len):
+    solver.add_clause(list(key) + [clause_selectors[key]])
+solver.append_formula(links)
+# The solver lives as long as the module: any later query can still reach it
+atexit.register(solver.delete)
+
+def is_inconsistent(r, phi_literal):
+    # Projection Sigma* (strata 0 to r active, the others disabled) [cite: 11, 19]
+    # plus negation of variable of interest (refutation principle) [cite: 5, 11]
+    assumptions = [-s_i for s_i in selectors[:r + 1]] + selectors[r + 1:] + [-phi_literal]
+    satisfiable = solver.solve(assumptions=assumptions)
+    # None means no answer (e.g. solver already deleted): never read it as UNSAT
+    if satisfiable is None:
+        raise RuntimeError("SAT solver returned no result (solver deleted or interrupted)")
+    return not satisfiable
+
+# strata never changes: the literal alone is a sound cache key
+@lru_cache(maxsize=None)
 def calculate_interest_variable(phi_literal):
-    # Initialize bounds as per algorithm 
     n = len(strata)
+    
+    # Whole base consistent with the negation: no inconsistency level, Val = 0
+    if not is_inconsistent(n - 1, phi_literal):
+        return 0
+    
+    # Exponential search first: probe r = 0, 1, 3, 7, ... until inconsistent, since the
+    # threshold usually lies in the first (heaviest) strata
     l = 0
-    u = n - 1
-    result_idx = -1
+    u = 0
+    while u < n - 1 and not is_inconsistent(u, phi_literal):
+        l = u + 1
+        u = min(2 * u + 1, n - 1)
+    result_idx = u
+    u = u - 1
 
-    while l <= u: # Dichotomy principle [cite: 9]
+    while l <= u: # Dichotomy principle on the bracket [l, result_idx] [cite: 9]
         r = (l + u) // 2 # [cite: 10]
         
-        # Create projection Sigma* (all clauses from level 0 to r) [cite: 11, 19]
-        with Glucose4() as solver:
-            for i in range(r + 1):
-                for clause in strata[i]["clauses"]:
-                    solver.add_clause(clause)
-            
-            # Add negation of variable of interest (refutation principle) [cite: 5, 11]
-            solver.add_clause([-phi_literal])
-            
-            if solver.solve(): # If consistent 
-                l = r + 1 # Target weight is likely lower (higher index)
-            else: # If inconsistent 
-                result_idx = r
-                u = r - 1
+        if is_inconsistent(r, phi_literal): # If inconsistent 
+            result_idx = r
+            u = r - 1
+        else: # If consistent 
+            l = r + 1 # Target weight is likely lower (higher index)
                 
-    if result_idx != -1:
-        return strata[result_idx]["weight"]
-    return 0
+    return strata[result_idx]["weight"]
 
 # Step 3: Calculate value for variable 'd' (literal 4) [cite: 25]
 # interest_val = calculate_interest_variable(4)
@@ -53,11 +91,12 @@ def calculate_interest_variable(phi_literal):
 # generate cvs results for all variables
 import csv
 variables = [1, 2, 3, 4, 5, 6]  # a, b, c, d, e, f
+# All dichotomies run back-to-back on the shared solver, then a single write
+rows = [[var, calculate_interest_variable(var)] for var in variables]
 with open('PossibilityTheory/interest_values.csv', mode='w', newline='') as file:
     writer = csv.writer(file)
     writer.writerow(['Variable', 'Interest Value'])
-    for var in variables:
-        interest_val = calculate_interest_variable(var)
-        writer.writerow([var, interest_val])
-    print(f"The value Val({var}, Sigma) is: {interest_val}")
+    writer.writerows(rows)
+var, interest_val = rows[-1]
+print(f"The value Val({var}, Sigma) is: {interest_val}")
 
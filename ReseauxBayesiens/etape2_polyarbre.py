@@ -25,10 +25,13 @@ Variable d'intérêt: Cambriolage (B)
 
 from pgmpy.models import DiscreteBayesianNetwork
 from pgmpy.factors.discrete import TabularCPD
-from pgmpy.inference import VariableElimination
-import matplotlib.pyplot as plt
-import networkx as nx
 import numpy as np
+import csv
+import os
+import sys
+
+from inference_einsum import compiler_tenseurs, requete_einsum
+from tableaux import formater_tableau
 
 
 class PolyarbreAlarme:
@@ -36,7 +39,12 @@ class PolyarbreAlarme:
     Modèle de polyarbre pour le système d'alarme classique
     """
     
-    def __init__(self):
+    def __init__(self, verifier=True):
+        """
+        Args:
+            verifier: Valider le modèle (check_model) après l'ajout des CPDs ;
+                      la validation est aussi ignorée sous python -O
+        """
         # Créer la structure du réseau (DAG)
         self.model = DiscreteBayesianNetwork([
             ('Cambriolage', 'Alarme'),
@@ -47,6 +55,13 @@ class PolyarbreAlarme:
         
         self._definir_cpds()
         
+        # Vérifier que le modèle est valide
+        if verifier:
+            assert self.model.check_model(), "Le modèle n'est pas valide!"
+        
+        # CPDs compilées une fois pour toutes les requêtes einsum (voir requete_einsum)
+        self._compilees = compiler_tenseurs(self.model)
+        
     def _definir_cpds(self):
         """
         Définir les distributions de probabilité conditionnelles (CPD)
@@ -131,9 +146,6 @@ class PolyarbreAlarme:
             cpd_mary
         )
         
-        # Vérifier que le modèle est valide
-        assert self.model.check_model(), "Le modèle n'est pas valide!"
-        
     def afficher_structure(self):
         """
         Afficher la structure du réseau bayésien
@@ -145,14 +157,19 @@ class PolyarbreAlarme:
         for edge in self.model.edges():
             print(f"  {edge[0]} → {edge[1]}")
         
+        # Parents et enfants de chaque nœud, lus une seule fois dans le graphe
+        nodes = list(self.model.nodes())
+        preds = {node: list(self.model.predecessors(node)) for node in nodes}
+        succs = {node: list(self.model.successors(node)) for node in nodes}
+        
         print("\nNœuds racine (sans parents):")
-        for node in self.model.nodes():
-            if len(list(self.model.predecessors(node))) == 0:
+        for node in nodes:
+            if not preds[node]:
                 print(f"  - {node}")
         
         print("\nNœuds feuilles (sans enfants):")
-        for node in self.model.nodes():
-            if len(list(self.model.successors(node))) == 0:
+        for node in nodes:
+            if not succs[node]:
                 print(f"  - {node}")
     
     def afficher_cpds(self):
@@ -173,8 +190,6 @@ class PolyarbreAlarme:
         Args:
             evidences: Dictionnaire des évidences {variable: état}
         """
-        inference = VariableElimination(self.model)
-        
         print("\n" + "="*70)
         print("INFÉRENCE BAYÉSIENNE")
         print("="*70)
@@ -185,10 +200,7 @@ class PolyarbreAlarme:
             print("\nAucune évidence (probabilités a priori)")
         
         # Calculer P(Cambriolage | evidences)
-        result = inference.query(
-            variables=['Cambriolage'],
-            evidence=evidences
-        )
+        result = requete_einsum(self._compilees, 'Cambriolage', evidences)
         
         print(f"\n{result}")
         
@@ -205,7 +217,16 @@ class PolyarbreAlarme:
     def visualiser_reseau(self, save_path='images/polyarbre_structure.png'):
         """
         Visualiser la structure du réseau
+        (RCR_NO_VIZ : aucune figure ; RCR_FAST_VIZ=1 : export à 100 dpi au lieu de 300)
         """
+        if os.environ.get('RCR_NO_VIZ'):
+            return
+        
+        # Imports coûteux limités à la visualisation
+        import matplotlib
+        import matplotlib.pyplot as plt
+        import networkx as nx
+        
         plt.figure(figsize=(12, 8))
         
         # Utiliser networkx pour le layout
@@ -218,32 +239,35 @@ class PolyarbreAlarme:
             'MaryAppelle': (1.5, 0)
         }
         
-        # Dessiner le graphe
-        nx.draw(
+        # Dessiner le graphe (positions fixées : nœuds, arêtes et libellés directement)
+        nx.draw_networkx_nodes(G, pos, node_color='lightblue', node_size=3000)
+        nx.draw_networkx_edges(
             G, pos,
-            with_labels=True,
-            node_color='lightblue',
             node_size=3000,
-            font_size=10,
-            font_weight='bold',
             arrows=True,
             arrowsize=20,
             arrowstyle='->',
             edge_color='gray',
             width=2
         )
+        nx.draw_networkx_labels(G, pos, font_size=10, font_weight='bold')
         
         plt.title("Polyarbre - Système d'Alarme", fontsize=16, fontweight='bold')
         plt.axis('off')
         plt.tight_layout()
         
         # Créer le dossier si nécessaire
-        import os
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
         
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        dpi = 100 if os.environ.get('RCR_FAST_VIZ') == '1' else 300
+        plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
         print(f"\nGraphique sauvegardé: {save_path}")
-        plt.show()
+        
+        # Affichage bloquant uniquement en session interactive avec un backend graphique
+        if sys.stdout.isatty() and matplotlib.get_backend().lower() != 'agg':
+            plt.show()
+        else:
+            plt.close()
     
     def scenarios_inference(self):
         """
@@ -305,12 +329,13 @@ class PolyarbreAlarme:
         print("TABLEAU RÉCAPITULATIF")
         print("="*70)
         
-        import pandas as pd
-        df = pd.DataFrame(resultats)
-        print(df.to_string(index=False))
+        print(formater_tableau(resultats))
         
         # Sauvegarder
-        df.to_csv('resultats/polyarbre_scenarios.csv', index=False)
+        with open('resultats/polyarbre_scenarios.csv', 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(resultats[0]), lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(resultats)
         print("\n✓ Résultats sauvegardés: ReseauxBayesiens/resultats/polyarbre_scenarios.csv")
 
 
@@ -322,8 +347,8 @@ def main():
     print("║" + " "*15 + "ETAPE 2: POLYARBRE - SYSTÈME D'ALARME" + " "*16 + "║")
     print("╚" + "="*68 + "╝")
     
-    # Créer le modèle
-    alarme = PolyarbreAlarme()
+    # Créer le modèle (--no-check : sans validation des CPDs)
+    alarme = PolyarbreAlarme(verifier='--no-check' not in sys.argv)
     
     # Afficher la structure
     alarme.afficher_structure()
@@ -331,8 +356,9 @@ def main():
     # Afficher les CPDs
     alarme.afficher_cpds()
     
-    # Visualiser le réseau
-    alarme.visualiser_reseau()
+    # Visualiser le réseau (--no-plot : résultats seuls, sans matplotlib)
+    if '--no-plot' not in sys.argv:
+        alarme.visualiser_reseau()
     
     # Tester différents scénarios
     alarme.scenarios_inference()
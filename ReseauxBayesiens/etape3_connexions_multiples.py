@@ -9,17 +9,24 @@ multiples plus complexes qu'un simple polyarbre.
 Nous utilisons pgmpy pour modéliser et effectuer l'inférence.
 """
 
-import pandas as pd
+import csv
 from pgmpy.models import DiscreteBayesianNetwork
 from pgmpy.factors.discrete import TabularCPD
-from pgmpy.inference import VariableElimination
-import matplotlib.pyplot as plt
-import networkx as nx
+import os
+import sys
 
-def create_complex_network():
+from inference_einsum import compiler_tenseurs, requete_einsum
+from tableaux import formater_tableau
+
+
+def create_complex_network(check=True):
     """
     Crée un réseau bayésien avec connexions multiples.
     
+    Args:
+        check: Valider le modèle (check_model) après l'ajout des CPDs ;
+               la validation est aussi ignorée sous python -O
+    
     Structure du réseau:
     - A et B sont des nœuds racine
     - C dépend de A et B (connexion multiple)
@@ -99,13 +106,24 @@ def create_complex_network():
     model.add_cpds(cpd_a, cpd_b, cpd_c, cpd_d, cpd_e)
     
     # Vérifier que le modèle est valide
-    assert model.check_model(), "Le modèle n'est pas valide!"
+    if check:
+        assert model.check_model(), "Le modèle n'est pas valide!"
     
     return model
 
 
 def visualize_network(model):
-    """Visualise le réseau bayésien."""
+    """
+    Visualise le réseau bayésien
+    (RCR_NO_VIZ : aucune figure ; RCR_FAST_VIZ=1 : export à 100 dpi au lieu de 300).
+    """
+    if os.environ.get('RCR_NO_VIZ'):
+        return
+    
+    # Imports coûteux limités à la visualisation
+    import matplotlib.pyplot as plt
+    import networkx as nx
+    
     plt.figure(figsize=(12, 8))
     
     # Créer le graphe
@@ -120,27 +138,29 @@ def visualize_network(model):
         'E': (2, 0)
     }
     
-    # Dessiner le réseau
-    nx.draw(G, pos, with_labels=True, node_color='lightblue', 
-            node_size=2000, font_size=16, font_weight='bold',
-            arrows=True, arrowsize=20, edge_color='gray', width=2)
+    # Dessiner le réseau (positions fixées : nœuds, arêtes et libellés directement)
+    nx.draw_networkx_nodes(G, pos, node_color='lightblue', node_size=2000)
+    nx.draw_networkx_edges(G, pos, node_size=2000, arrows=True, arrowsize=20,
+                           edge_color='gray', width=2)
+    nx.draw_networkx_labels(G, pos, font_size=16, font_weight='bold')
     
     plt.title("Réseau Bayésien avec Connexions Multiples\n" + 
               "DAG général (non-polyarbre)", fontsize=14, fontweight='bold')
     plt.axis('off')
     plt.tight_layout()
-    plt.savefig('images/connexions_multiples_structure.png', dpi=300, bbox_inches='tight')
+    dpi = 100 if os.environ.get('RCR_FAST_VIZ') == '1' else 300
+    plt.savefig('images/connexions_multiples_structure.png', dpi=dpi, bbox_inches='tight')
     print("✓ Graphe sauvegardé: ReseauxBayesiens/images/connexions_multiples_structure.png")
 
 
 def perform_inference(model):
     """Effectue plusieurs inférences sur le réseau."""
     
-    # Créer l'objet d'inférence par élimination de variables
-    inference = VariableElimination(model)
-    
     results = []
     
+    # CPDs compilées une fois pour toutes les requêtes ci-dessous (voir requete_einsum)
+    compiled = compiler_tenseurs(model)
+    
     print("\n" + "="*70)
     print("INFÉRENCE DANS LE RÉSEAU À CONNEXIONS MULTIPLES")
     print("="*70)
@@ -148,7 +168,7 @@ def perform_inference(model):
     # Scénario 1: Distribution a priori de E (sans évidence)
     print("\n--- Scénario 1: Distribution a priori ---")
     print("Question: P(E) sans aucune évidence")
-    result1 = inference.query(variables=['E'])
+    result1 = requete_einsum(compiled, 'E')
     print(result1)
     results.append({
         'Scenario': 'A priori',
@@ -161,7 +181,7 @@ def perform_inference(model):
     # Scénario 2: E sachant A=1
     print("\n--- Scénario 2: Évidence simple ---")
     print("Question: P(E | A=1)")
-    result2 = inference.query(variables=['E'], evidence={'A': 1})
+    result2 = requete_einsum(compiled, 'E', {'A': 1})
     print(result2)
     results.append({
         'Scenario': 'Évidence A',
@@ -174,7 +194,7 @@ def perform_inference(model):
     # Scénario 3: E sachant A=1 et B=1 (deux évidences)
     print("\n--- Scénario 3: Évidences multiples (A et B) ---")
     print("Question: P(E | A=1, B=1)")
-    result3 = inference.query(variables=['E'], evidence={'A': 1, 'B': 1})
+    result3 = requete_einsum(compiled, 'E', {'A': 1, 'B': 1})
     print(result3)
     results.append({
         'Scenario': 'Évidences A,B',
@@ -187,7 +207,7 @@ def perform_inference(model):
     # Scénario 4: D sachant E=1 (inférence remontante)
     print("\n--- Scénario 4: Inférence remontante ---")
     print("Question: P(D | E=1)")
-    result4 = inference.query(variables=['D'], evidence={'E': 1})
+    result4 = requete_einsum(compiled, 'D', {'E': 1})
     print(result4)
     results.append({
         'Scenario': 'Inférence remontante',
@@ -200,7 +220,7 @@ def perform_inference(model):
     # Scénario 5: C sachant E=1 et A=0
     print("\n--- Scénario 5: Évidence mixte ---")
     print("Question: P(C | E=1, A=0)")
-    result5 = inference.query(variables=['C'], evidence={'E': 1, 'A': 0})
+    result5 = requete_einsum(compiled, 'C', {'E': 1, 'A': 0})
     print(result5)
     results.append({
         'Scenario': 'Évidence mixte',
@@ -213,7 +233,7 @@ def perform_inference(model):
     # Scénario 6: Inférence avec toutes les évidences intermédiaires
     print("\n--- Scénario 6: Chemin complet d'évidence ---")
     print("Question: P(E | A=1, C=1)")
-    result6 = inference.query(variables=['E'], evidence={'A': 1, 'C': 1})
+    result6 = requete_einsum(compiled, 'E', {'A': 1, 'C': 1})
     print(result6)
     results.append({
         'Scenario': 'Chemin complet',
@@ -228,11 +248,13 @@ def perform_inference(model):
 
 def save_results(results):
     """Sauvegarde les résultats dans un fichier CSV."""
-    df = pd.DataFrame(results)
-    df.to_csv('resultats/connexions_multiples_results.csv', index=False)
+    with open('resultats/connexions_multiples_results.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]), lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(results)
     print(f"\n✓ Résultats sauvegardés: ReseauxBayesiens/resultats/connexions_multiples_results.csv")
     print("\nTableau des résultats:")
-    print(df.to_string(index=False))
+    print(formater_tableau(results))
 
 
 def analyze_network_properties(model):
@@ -247,17 +269,20 @@ def analyze_network_properties(model):
     print(f"\nNombre d'arêtes: {len(model.edges())}")
     print(f"Arêtes: {list(model.edges())}")
     
+    # Parents et enfants de chaque nœud, lus une seule fois dans le graphe
+    preds = {node: list(model.predecessors(node)) for node in model.nodes()}
+    succs = {node: list(model.successors(node)) for node in model.nodes()}
+    
     print("\nNœuds racine (sans parents):")
-    roots = [node for node in model.nodes() if len(list(model.predecessors(node))) == 0]
+    roots = [node for node, parents in preds.items() if not parents]
     print(f"  {roots}")
     
     print("\nNœuds feuilles (sans enfants):")
-    leaves = [node for node in model.nodes() if len(list(model.successors(node))) == 0]
+    leaves = [node for node, children in succs.items() if not children]
     print(f"  {leaves}")
     
     print("\nNombre de parents par nœud:")
-    for node in model.nodes():
-        parents = list(model.predecessors(node))
+    for node, parents in preds.items():
         print(f"  {node}: {len(parents)} parent(s) {parents if parents else ''}")
     
     print("\n✓ Ce réseau contient des CONNEXIONS MULTIPLES:")
@@ -269,6 +294,7 @@ def analyze_network_properties(model):
     print("  - Ce n'est donc PAS un polyarbre!")
     
     # Vérifier l'acyclicité
+    import networkx as nx
     G = nx.DiGraph(model.edges())
     print(f"\n✓ Le graphe est acyclique: {nx.is_directed_acyclic_graph(G)}")
 
@@ -279,17 +305,24 @@ def main():
     print("ÉTAPE 3: RÉSEAU BAYÉSIEN AVEC CONNEXIONS MULTIPLES")
     print("="*70)
     
-    # Créer le réseau
+    # Créer le réseau (--no-check : sans validation des CPDs)
     print("\n1. Création du réseau bayésien...")
-    model = create_complex_network()
-    print("✓ Réseau créé et validé avec succès!")
+    check = '--no-check' not in sys.argv
+    model = create_complex_network(check=check)
+    if not check:
+        print("✓ Réseau créé (validation ignorée : --no-check)")
+    elif not __debug__:
+        print("✓ Réseau créé (validation ignorée : python -O)")
+    else:
+        print("✓ Réseau créé et validé avec succès!")
     
     # Analyser les propriétés
     analyze_network_properties(model)
     
-    # Visualiser
-    print("\n2. Visualisation du réseau...")
-    visualize_network(model)
+    # Visualiser (--no-plot : résultats seuls, sans matplotlib)
+    if '--no-plot' not in sys.argv:
+        print("\n2. Visualisation du réseau...")
+        visualize_network(model)
     
     # Effectuer l'inférence
     print("\n3. Inférence bayésienne...")
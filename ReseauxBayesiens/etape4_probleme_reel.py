@@ -41,10 +41,126 @@ Structure du réseau (connexions multiples):
 from pgmpy.models import DiscreteBayesianNetwork
 from pgmpy.factors.discrete import TabularCPD
 from pgmpy.inference import VariableElimination, BeliefPropagation
-import matplotlib.pyplot as plt
-import networkx as nx
-import pandas as pd
 import numpy as np
+import csv
+import hashlib
+import os
+import sys
+from time import perf_counter_ns
+
+from tableaux import formater_tableau
+
+
+# Maladies interrogées ensemble à chaque diagnostic
+MALADIES = ['Grippe', 'COVID19', 'Allergie']
+
+# Variables de contexte (racines du réseau), renseignées pour tous les patients
+CONTEXTE = ['Saison', 'VaccinationCOVID']
+
+# Symptômes observables et tests médicaux
+SYMPTOMES = ['Fievre', 'Toux', 'Fatigue', 'EcoulementNasal']
+TESTS = ['TestCOVID', 'AnalyseSang']
+
+# Nombre d'exécutions moyennées par algorithme dans comparer_algorithmes
+REPETITIONS_BENCHMARK = 20
+
+# Barres de progression précalculées (0 à 50 blocs pleins)
+_BARS = ['█' * i + '░' * (50 - i) for i in range(51)]
+
+# États de chaque variable (l'ordre fixe les lignes/colonnes des CPDs)
+ETATS = {
+    'Saison': ['Ete', 'Hiver'],
+    'VaccinationCOVID': ['Non', 'Oui'],
+    'Grippe': ['Non', 'Oui'],
+    'COVID19': ['Non', 'Oui'],
+    'Allergie': ['Non', 'Oui'],
+    'Fievre': ['Non', 'Oui'],
+    'Toux': ['Non', 'Oui'],
+    'Fatigue': ['Non', 'Oui'],
+    'EcoulementNasal': ['Non', 'Oui'],
+    'TestCOVID': ['Negatif', 'Positif'],
+    'AnalyseSang': ['Normal', 'Anormal'],
+}
+
+# Distributions de probabilité conditionnelles : une ligne par état de la variable,
+# une colonne par combinaison d'états des parents
+CPD_SPECS = [
+    # ===== VARIABLES DE CONTEXTE =====
+    
+    # Saison (Hiver/Été) : 50-50
+    {'variable': 'Saison', 'parents': [],
+     'valeurs': [[0.5], [0.5]]},
+    
+    # Vaccination COVID : 70% vaccinés
+    {'variable': 'VaccinationCOVID', 'parents': [],
+     'valeurs': [[0.3], [0.7]]},
+    
+    # ===== MALADIES =====
+    
+    # Grippe | Saison : plus probable en hiver
+    {'variable': 'Grippe', 'parents': ['Saison'],
+     'valeurs': [[0.98, 0.90],    # P(Grippe=Non | Saison)
+                 [0.02, 0.10]]},  # P(Grippe=Oui | Saison)
+    
+    # COVID-19 | Vaccination : la vaccination réduit le risque
+    {'variable': 'COVID19', 'parents': ['VaccinationCOVID'],
+     'valeurs': [[0.94, 0.98],    # P(COVID=Non | Vaccination)
+                 [0.06, 0.02]]},  # P(COVID=Oui | Vaccination)
+    
+    # Allergie | Saison : plus probable en été (pollens)
+    {'variable': 'Allergie', 'parents': ['Saison'],
+     'valeurs': [[0.80, 0.95],    # P(Allergie=Non | Saison)
+                 [0.20, 0.05]]},  # P(Allergie=Oui | Saison)
+    
+    # ===== SYMPTÔMES =====
+    
+    # Fièvre | Grippe, COVID
+    {'variable': 'Fievre', 'parents': ['Grippe', 'COVID19'],
+     'valeurs': [[0.99, 0.30, 0.20, 0.10],    # P(Fievre=Non | ...)
+                 [0.01, 0.70, 0.80, 0.90]]},  # P(Fievre=Oui | ...)
+    
+    # Toux | Grippe, COVID, Allergie
+    {'variable': 'Toux', 'parents': ['Grippe', 'COVID19', 'Allergie'],
+     'valeurs': [[0.95, 0.30, 0.40, 0.15, 0.20, 0.10, 0.15, 0.05],    # Non
+                 [0.05, 0.70, 0.60, 0.85, 0.80, 0.90, 0.85, 0.95]]},  # Oui
+    
+    # Fatigue | Grippe, COVID
+    {'variable': 'Fatigue', 'parents': ['Grippe', 'COVID19'],
+     'valeurs': [[0.90, 0.30, 0.20, 0.10],    # Non
+                 [0.10, 0.70, 0.80, 0.90]]},  # Oui
+    
+    # Écoulement nasal | Allergie
+    {'variable': 'EcoulementNasal', 'parents': ['Allergie'],
+     'valeurs': [[0.95, 0.20],    # Non
+                 [0.05, 0.80]]},  # Oui
+    
+    # ===== TESTS MÉDICAUX =====
+    
+    # Test COVID | COVID : sensibilité 85%, spécificité 98%
+    {'variable': 'TestCOVID', 'parents': ['COVID19'],
+     'valeurs': [[0.98, 0.15],    # Négatif
+                 [0.02, 0.85]]},  # Positif
+    
+    # Analyse sanguine | Grippe, COVID
+    {'variable': 'AnalyseSang', 'parents': ['Grippe', 'COVID19'],
+     'valeurs': [[0.95, 0.30, 0.40, 0.20],    # Normal
+                 [0.05, 0.70, 0.60, 0.80]]},  # Anormal
+]
+
+# Libellés français affichés pour chaque nœud du réseau
+NOMS_FR = {
+    'Saison': 'Saison',
+    'VaccinationCOVID': 'Vaccination COVID',
+    'Grippe': 'Grippe',
+    'COVID19': 'COVID-19',
+    'Allergie': 'Allergie',
+    'Fievre': 'Fièvre',
+    'Toux': 'Toux',
+    'Fatigue': 'Fatigue',
+    'EcoulementNasal': 'Écoulement nasal',
+    'TestCOVID': 'Test COVID',
+    'AnalyseSang': 'Analyse sanguine',
+}
 
 
 class DiagnosticMedical:
@@ -52,7 +168,12 @@ class DiagnosticMedical:
     Réseau Bayésien pour le diagnostic médical de maladies respiratoires
     """
     
-    def __init__(self):
+    def __init__(self, verifier=True):
+        """
+        Args:
+            verifier: Valider le modèle (check_model) après l'ajout des CPDs ;
+                      la validation est aussi ignorée sous python -O
+        """
         # Créer la structure du réseau avec connexions multiples
         self.model = DiscreteBayesianNetwork([
             # Influences contextuelles
@@ -83,197 +204,152 @@ class DiagnosticMedical:
         
         self._definir_cpds()
         
-    def _definir_cpds(self):
-        """
-        Définir toutes les distributions de probabilité conditionnelles
-        """
-        
-        # ===== VARIABLES DE CONTEXTE =====
-        
-        # CPD Saison (Hiver/Été)
-        cpd_saison = TabularCPD(
-            variable='Saison',
-            variable_card=2,
-            values=[[0.5], [0.5]],  # 50-50 Hiver/Été
-            state_names={'Saison': ['Ete', 'Hiver']}
-        )
-        
-        # CPD Vaccination COVID
-        cpd_vaccination = TabularCPD(
-            variable='VaccinationCOVID',
-            variable_card=2,
-            values=[[0.3], [0.7]],  # 70% vaccinés
-            state_names={'VaccinationCOVID': ['Non', 'Oui']}
-        )
+        # Vérifier le modèle
+        if verifier:
+            assert self.model.check_model(), "Le modèle n'est pas valide!"
         
-        # ===== MALADIES =====
-        
-        # CPD Grippe | Saison
-        # Plus probable en hiver
-        cpd_grippe = TabularCPD(
-            variable='Grippe',
-            variable_card=2,
-            values=[
-                [0.98, 0.90],  # P(Grippe=Non | Saison)
-                [0.02, 0.10]   # P(Grippe=Oui | Saison)
-            ],
-            evidence=['Saison'],
-            evidence_card=[2],
-            state_names={
-                'Grippe': ['Non', 'Oui'],
-                'Saison': ['Ete', 'Hiver']
-            }
-        )
+        # Moteurs d'inférence construits une seule fois et réutilisés par toutes les requêtes
+        # (pas de calibrate() préalable : BeliefPropagation.query élague le modèle selon
+        # les évidences puis se réinitialise, ce qui efface toute calibration antérieure)
+        self._ve = VariableElimination(self.model)
+        self._bp = BeliefPropagation(self.model)
         
-        # CPD COVID-19 | Vaccination
-        # Vaccination réduit le risque
-        cpd_covid = TabularCPD(
-            variable='COVID19',
-            variable_card=2,
-            values=[
-                [0.94, 0.98],  # P(COVID=Non | Vaccination)
-                [0.06, 0.02]   # P(COVID=Oui | Vaccination)
-            ],
-            evidence=['VaccinationCOVID'],
-            evidence_card=[2],
-            state_names={
-                'COVID19': ['Non', 'Oui'],
-                'VaccinationCOVID': ['Non', 'Oui']
-            }
-        )
+        # Moteurs Belief Propagation spécialisés par contexte observé, construits à la demande
+        self._bp_reduits = {}
         
-        # CPD Allergie | Saison
-        # Plus probable en été (pollens)
-        cpd_allergie = TabularCPD(
-            variable='Allergie',
-            variable_card=2,
-            values=[
-                [0.80, 0.95],  # P(Allergie=Non | Saison)
-                [0.20, 0.05]   # P(Allergie=Oui | Saison)
-            ],
-            evidence=['Saison'],
-            evidence_card=[2],
-            state_names={
-                'Allergie': ['Non', 'Oui'],
-                'Saison': ['Ete', 'Hiver']
-            }
-        )
-        
-        # ===== SYMPTÔMES =====
-        
-        # CPD Fièvre | Grippe, COVID
-        cpd_fievre = TabularCPD(
-            variable='Fievre',
-            variable_card=2,
-            values=[
-                [0.99, 0.30, 0.20, 0.10],  # P(Fievre=Non | ...)
-                [0.01, 0.70, 0.80, 0.90]   # P(Fievre=Oui | ...)
-            ],
-            evidence=['Grippe', 'COVID19'],
-            evidence_card=[2, 2],
-            state_names={
-                'Fievre': ['Non', 'Oui'],
-                'Grippe': ['Non', 'Oui'],
-                'COVID19': ['Non', 'Oui']
-            }
-        )
+        self._compiler_tenseurs()
         
-        # CPD Toux | Grippe, COVID, Allergie
-        cpd_toux = TabularCPD(
-            variable='Toux',
-            variable_card=2,
-            values=[
-                [0.95, 0.30, 0.40, 0.15, 0.20, 0.10, 0.15, 0.05],  # Non
-                [0.05, 0.70, 0.60, 0.85, 0.80, 0.90, 0.85, 0.95]   # Oui
-            ],
-            evidence=['Grippe', 'COVID19', 'Allergie'],
-            evidence_card=[2, 2, 2],
-            state_names={
-                'Toux': ['Non', 'Oui'],
-                'Grippe': ['Non', 'Oui'],
-                'COVID19': ['Non', 'Oui'],
-                'Allergie': ['Non', 'Oui']
-            }
-        )
+    def _definir_cpds(self):
+        """
+        Définir toutes les distributions de probabilité conditionnelles (à partir de CPD_SPECS)
+        """
+        self.model.add_cpds(*[
+            TabularCPD(
+                variable=spec['variable'],
+                variable_card=len(ETATS[spec['variable']]),
+                values=spec['valeurs'],
+                evidence=spec['parents'] or None,
+                evidence_card=[len(ETATS[parent]) for parent in spec['parents']] or None,
+                state_names={var: ETATS[var] for var in [spec['variable'], *spec['parents']]}
+            )
+            for spec in CPD_SPECS
+        ])
+    
+    def _compiler_tenseurs(self):
+        """
+        Compiler les CPDs en tableaux NumPy et précalculer la loi jointe complète : avec onze
+        variables binaires elle ne compte que 2048 valeurs, et chaque requête se réduit alors
+        à une indexation par les évidences suivie d'une somme
+        """
+        self._axes = {var: i for i, var in enumerate(self.model.nodes())}
+        self._etats = {}
+        operandes = []
+        for cpd in self.model.get_cpds():
+            self._etats[cpd.variable] = cpd.state_names[cpd.variable]
+            operandes += [np.ascontiguousarray(cpd.values, dtype=np.float64),
+                          [self._axes[var] for var in cpd.variables]]
+        
+        # Produit de toutes les CPDs, un axe par nœud (dans l'ordre de self._axes)
+        self._jointe = np.einsum(*operandes, list(self._axes.values()), optimize='greedy')
+        
+        # Résultats mémoïsés par (variables de requête, évidences figées)
+        self._cache_requetes = {}
+    
+    def requete_jointe(self, variables, evidences=None):
+        """
+        Calculer P(variables | évidences) à partir de la loi jointe précalculée
         
-        # CPD Fatigue | Grippe, COVID
-        cpd_fatigue = TabularCPD(
-            variable='Fatigue',
-            variable_card=2,
-            values=[
-                [0.90, 0.30, 0.20, 0.10],  # Non
-                [0.10, 0.70, 0.80, 0.90]   # Oui
-            ],
-            evidence=['Grippe', 'COVID19'],
-            evidence_card=[2, 2],
-            state_names={
-                'Fatigue': ['Non', 'Oui'],
-                'Grippe': ['Non', 'Oui'],
-                'COVID19': ['Non', 'Oui']
-            }
-        )
+        Args:
+            variables: Variables de requête
+            evidences: Dictionnaire des évidences {variable: état}
         
-        # CPD Écoulement nasal | Allergie
-        cpd_ecoulement = TabularCPD(
-            variable='EcoulementNasal',
-            variable_card=2,
-            values=[
-                [0.95, 0.20],  # Non
-                [0.05, 0.80]   # Oui
-            ],
-            evidence=['Allergie'],
-            evidence_card=[2],
-            state_names={
-                'EcoulementNasal': ['Non', 'Oui'],
-                'Allergie': ['Non', 'Oui']
-            }
-        )
+        Returns:
+            Tableau NumPy normalisé (en lecture seule, partagé entre requêtes identiques),
+            un axe par variable de requête (dans l'ordre donné)
         
-        # ===== TESTS MÉDICAUX =====
-        
-        # CPD Test COVID | COVID
-        # Sensibilité: 85%, Spécificité: 98%
-        cpd_test_covid = TabularCPD(
-            variable='TestCOVID',
-            variable_card=2,
-            values=[
-                [0.98, 0.15],  # Négatif
-                [0.02, 0.85]   # Positif
-            ],
-            evidence=['COVID19'],
-            evidence_card=[2],
-            state_names={
-                'TestCOVID': ['Negatif', 'Positif'],
-                'COVID19': ['Non', 'Oui']
-            }
-        )
+        Raises:
+            ValueError: Variable ou état inconnu du réseau, variable interrogée
+                plusieurs fois ou à la fois interrogée et observée
+        """
+        evidences = evidences or {}
+        # Mêmes refus que VariableElimination.query, avant tout calcul ou mise en cache
+        inconnues = [var for var in [*variables, *evidences] if var not in self._axes]
+        if inconnues:
+            raise ValueError(f"Variables absentes du réseau: {inconnues}")
+        doublons = sorted({var for var in variables if variables.count(var) > 1})
+        if doublons:
+            raise ValueError(f"Variables interrogées plusieurs fois: {doublons}")
+        communes = set(variables) & set(evidences)
+        if communes:
+            raise ValueError(f"Variables à la fois interrogées et observées: {sorted(communes)}")
+        for var, etat in evidences.items():
+            if etat not in self._etats[var]:
+                raise ValueError(f"État inconnu pour {var}: {etat!r} (attendu: {self._etats[var]})")
+        
+        cle = (tuple(variables), frozenset(evidences.items()))
+        if cle in self._cache_requetes:
+            return self._cache_requetes[cle]
+        
+        # Fixer les axes observés, puis sommer les autres axes non interrogés
+        index = tuple(self._etats[var].index(evidences[var]) if var in evidences else slice(None)
+                      for var in self._axes)
+        restantes = [self._axes[var] for var in self._axes if var not in evidences]
+        valeurs = np.einsum(self._jointe[index], restantes, [self._axes[var] for var in variables])
+        valeurs /= valeurs.sum()
+        
+        valeurs.flags.writeable = False
+        self._cache_requetes[cle] = valeurs
+        return valeurs
+    
+    def requete_groupee(self, variables, liste_evidences):
+        """
+        Calculer P(variables | évidences) pour plusieurs patients
         
-        # CPD Analyse sanguine | Grippe, COVID
-        cpd_analyse = TabularCPD(
-            variable='AnalyseSang',
-            variable_card=2,
-            values=[
-                [0.95, 0.30, 0.40, 0.20],  # Normal
-                [0.05, 0.70, 0.60, 0.80]   # Anormal
-            ],
-            evidence=['Grippe', 'COVID19'],
-            evidence_card=[2, 2],
-            state_names={
-                'AnalyseSang': ['Normal', 'Anormal'],
-                'Grippe': ['Non', 'Oui'],
-                'COVID19': ['Non', 'Oui']
-            }
-        )
+        Args:
+            variables: Variables de requête
+            liste_evidences: Liste de dictionnaires d'évidences {variable: état}, un par patient
         
-        # Ajouter tous les CPDs
-        self.model.add_cpds(
-            cpd_saison, cpd_vaccination, cpd_grippe, cpd_covid, cpd_allergie,
-            cpd_fievre, cpd_toux, cpd_fatigue, cpd_ecoulement,
-            cpd_test_covid, cpd_analyse
-        )
+        Returns:
+            Tableau NumPy de forme (patients, états de chaque variable...), normalisé par patient
+        """
+        return np.stack([self.requete_jointe(variables, evidences) for evidences in liste_evidences])
+    
+    def _bp_reduit(self, evidences):
+        """
+        Choisir un moteur Belief Propagation spécialisé lorsque tout le contexte (CONTEXTE)
+        est observé : les racines sont retirées du réseau et les CPDs de leurs enfants
+        réduites à l'état observé, ce qui évite deux jointures à chaque requête
         
-        # Vérifier le modèle
-        assert self.model.check_model(), "Le modèle n'est pas valide!"
+        Returns:
+            Tuple (moteur, évidences restantes à transmettre au moteur)
+        """
+        contexte = tuple(evidences.get(var) for var in CONTEXTE)
+        if None in contexte:
+            return self._bp, evidences
+        
+        if contexte not in self._bp_reduits:
+            observes = dict(zip(CONTEXTE, contexte))
+            modele = DiscreteBayesianNetwork([arc for arc in self.model.edges() if arc[0] not in observes])
+            modele.add_nodes_from([var for var in self.model.nodes() if var not in observes])
+            for cpd in self.model.get_cpds():
+                if cpd.variable in observes:
+                    continue
+                parents = [(parent, observes[parent]) for parent in cpd.get_evidence() if parent in observes]
+                modele.add_cpds(cpd.reduce(parents, inplace=False) if parents else cpd)
+            self._bp_reduits[contexte] = BeliefPropagation(modele)
+        
+        return self._bp_reduits[contexte], {var: etat for var, etat in evidences.items() if var not in CONTEXTE}
+    
+    @staticmethod
+    def probabilites_oui(jointe):
+        """
+        Extraire P(maladie=Oui) de la loi jointe des maladies (un axe par maladie, dans
+        l'ordre de MALADIES) en sommant sur les autres axes
+        """
+        return {
+            maladie: jointe.sum(axis=tuple(a for a in range(len(MALADIES)) if a != k))[1]
+            for k, maladie in enumerate(MALADIES)
+        }
     
     def afficher_structure(self):
         """
@@ -290,20 +366,36 @@ class DiagnosticMedical:
             print(f"  {edge[0]} → {edge[1]}")
         
         print("\nNœuds par type:")
-        contexte = ['Saison', 'VaccinationCOVID']
-        maladies = ['Grippe', 'COVID19', 'Allergie']
-        symptomes = ['Fievre', 'Toux', 'Fatigue', 'EcoulementNasal']
-        tests = ['TestCOVID', 'AnalyseSang']
-        
-        print(f"  Contexte: {', '.join(contexte)}")
-        print(f"  Maladies: {', '.join(maladies)}")
-        print(f"  Symptômes: {', '.join(symptomes)}")
-        print(f"  Tests: {', '.join(tests)}")
+        print(f"  Contexte: {', '.join(CONTEXTE)}")
+        print(f"  Maladies: {', '.join(MALADIES)}")
+        print(f"  Symptômes: {', '.join(SYMPTOMES)}")
+        print(f"  Tests: {', '.join(TESTS)}")
     
     def visualiser_reseau(self, save_path='images/diagnostic_medical_structure.png'):
         """
         Visualiser le réseau bayésien
+        (RCR_NO_VIZ : aucune figure ; RCR_FAST_VIZ=1 : export à 100 dpi au lieu de 300).
+        L'image n'est pas régénérée si la structure et la résolution sont inchangées
+        depuis le dernier export (empreinte stockée dans save_path + '.sha').
         """
+        if os.environ.get('RCR_NO_VIZ'):
+            return
+        
+        dpi = 100 if os.environ.get('RCR_FAST_VIZ') == '1' else 300
+        empreinte = hashlib.sha1(repr((sorted(self.model.edges()), dpi)).encode()).hexdigest()
+        chemin_empreinte = save_path + '.sha'
+        if os.path.exists(save_path) and os.path.exists(chemin_empreinte):
+            with open(chemin_empreinte, encoding='utf-8') as f:
+                if f.read().strip() == empreinte:
+                    print(f"\n✓ Graphique à jour (structure inchangée): {save_path}")
+                    return
+        
+        # Imports coûteux limités à la visualisation (et seulement si l'image est à refaire)
+        import matplotlib
+        import matplotlib.pyplot as plt
+        from matplotlib.patches import Patch
+        import networkx as nx
+        
         plt.figure(figsize=(16, 12))
         
         G = nx.DiGraph(self.model.edges())
@@ -333,11 +425,11 @@ class DiagnosticMedical:
         # Couleurs par type
         node_colors = []
         for node in G.nodes():
-            if node in ['Saison', 'VaccinationCOVID']:
+            if node in CONTEXTE:
                 node_colors.append('#FFE5B4')  # Beige (contexte)
-            elif node in ['Grippe', 'COVID19', 'Allergie']:
+            elif node in MALADIES:
                 node_colors.append('#FFB6C1')  # Rose (maladies)
-            elif node in ['Fievre', 'Toux', 'Fatigue', 'EcoulementNasal']:
+            elif node in SYMPTOMES:
                 node_colors.append('#87CEEB')  # Bleu clair (symptômes)
             else:
                 node_colors.append('#90EE90')  # Vert clair (tests)
@@ -358,7 +450,6 @@ class DiagnosticMedical:
         )
         
         # Légende
-        from matplotlib.patches import Patch
         legend_elements = [
             Patch(facecolor='#FFE5B4', label='Contexte'),
             Patch(facecolor='#FFB6C1', label='Maladies'),
@@ -370,13 +461,20 @@ class DiagnosticMedical:
         plt.title("Réseau Bayésien - Diagnostic Médical", fontsize=18, fontweight='bold', pad=20)
         plt.axis('off')
         
-        import os
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
+        with open(chemin_empreinte, 'w', encoding='utf-8') as f:
+            f.write(empreinte + '\n')
         print(f"\n✓ Graphique sauvegardé: {save_path}")
-        plt.show()
+        
+        # Affichage bloquant uniquement en session interactive avec un backend graphique
+        if sys.stdout.isatty() and matplotlib.get_backend().lower() != 'agg':
+            plt.show()
+        else:
+            plt.close()
     
-    def cas_clinique(self, nom_patient, age, evidences, use_belief_propagation=False):
+    def cas_clinique(self, nom_patient, age, evidences, use_belief_propagation=False,
+                     probabilites=None):
         """
         Analyser un cas clinique avec inférence bayésienne
         
@@ -384,15 +482,16 @@ class DiagnosticMedical:
             nom_patient: Nom du patient
             age: Âge du patient
             evidences: Dictionnaire des observations
-            use_belief_propagation: Si True, utilise Belief Propagation au lieu de Variable Elimination
+            use_belief_propagation: Si True, utilise Belief Propagation au lieu de la loi jointe
+                précalculée
+            probabilites: Dictionnaire {maladie: P(maladie=Oui)} déjà calculé (par exemple par
+                requete_groupee) ; si fourni, aucune inférence n'est relancée
         """
         # Choisir l'algorithme d'inférence
-        if use_belief_propagation:
-            inference = BeliefPropagation(self.model)
+        if use_belief_propagation and probabilites is None:
             algo_name = "Belief Propagation"
         else:
-            inference = VariableElimination(self.model)
-            algo_name = "Variable Elimination"
+            algo_name = "Loi jointe précalculée (inférence exacte)"
         
         print("\n" + "="*80)
         print(f"CAS CLINIQUE: {nom_patient}, {age} ans")
@@ -402,28 +501,36 @@ class DiagnosticMedical:
         print("\n📋 Observations cliniques:")
         for var, val in evidences.items():
             # Convertir les noms de variables en français
-            var_fr = var.replace('Saison', 'Saison').replace('VaccinationCOVID', 'Vaccination COVID')
-            var_fr = var_fr.replace('Fievre', 'Fièvre').replace('Toux', 'Toux')
-            var_fr = var_fr.replace('Fatigue', 'Fatigue').replace('EcoulementNasal', 'Écoulement nasal')
-            var_fr = var_fr.replace('TestCOVID', 'Test COVID').replace('AnalyseSang', 'Analyse sanguine')
+            var_fr = NOMS_FR.get(var, var)
             print(f"  • {var_fr}: {val}")
         
         # Inférence pour chaque maladie
         print("\n🔬 PROBABILITÉS DE DIAGNOSTIC:")
         print("-" * 80)
         
+        if probabilites is None and use_belief_propagation:
+            # Une seule requête jointe sur les trois maladies (les facteurs intermédiaires sont
+            # partagés), puis marginalisation de la loi 2×2×2 obtenue
+            moteur, restantes = self._bp_reduit(evidences)
+            jointe = moteur.query(variables=MALADIES, evidence=restantes, show_progress=False)
+            probabilites = {
+                maladie: jointe.marginalize([m for m in MALADIES if m != maladie], inplace=False).values[1]
+                for maladie in MALADIES
+            }
+        elif probabilites is None:
+            probabilites = self.probabilites_oui(self.requete_jointe(MALADIES, evidences))
+        
         resultats = {}
-        for maladie in ['Grippe', 'COVID19', 'Allergie']:
-            result = inference.query(variables=[maladie], evidence=evidences)
-            prob_oui = result.values[1]
+        for maladie in MALADIES:
+            prob_oui = probabilites[maladie]
             resultats[maladie] = prob_oui
             
-            maladie_fr = maladie.replace('COVID19', 'COVID-19')
+            maladie_fr = NOMS_FR[maladie]
             print(f"\n{maladie_fr}:")
             print(f"  P({maladie_fr}=Oui | observations) = {prob_oui:.4f} ({prob_oui*100:.2f}%)")
             
             # Barre de progression visuelle
-            barre = '█' * int(prob_oui * 50) + '░' * (50 - int(prob_oui * 50))
+            barre = _BARS[int(prob_oui * 50)]
             print(f"  [{barre}]")
         
         # Diagnostic le plus probable
@@ -431,7 +538,7 @@ class DiagnosticMedical:
         prob_max = resultats[maladie_probable]
         
         print("\n" + "="*80)
-        print(f"💡 DIAGNOSTIC LE PLUS PROBABLE: {maladie_probable.replace('COVID19', 'COVID-19')}")
+        print(f"💡 DIAGNOSTIC LE PLUS PROBABLE: {NOMS_FR[maladie_probable]}")
         print(f"   Probabilité: {prob_max:.4f} ({prob_max*100:.2f}%)")
         
         if prob_max > 0.7:
@@ -494,9 +601,12 @@ class DiagnosticMedical:
             }
         ]
         
+        # Lois jointes des maladies pour les trois patients (axe « patient » en tête)
+        jointes = self.requete_groupee(MALADIES, [patient['evidences'] for patient in cas])
+        
         tous_resultats = []
         
-        for i, patient in enumerate(cas, 1):
+        for i, (patient, jointe) in enumerate(zip(cas, jointes), 1):
             print(f"\n{'#'*80}")
             print(f"# PATIENT {i}/3")
             print(f"{'#'*80}")
@@ -504,7 +614,8 @@ class DiagnosticMedical:
             resultats = self.cas_clinique(
                 patient['nom'],
                 patient['age'],
-                patient['evidences']
+                patient['evidences'],
+                probabilites=self.probabilites_oui(jointe)
             )
             
             tous_resultats.append({
@@ -519,10 +630,12 @@ class DiagnosticMedical:
         print("\n" + "="*80)
         print("TABLEAU RÉCAPITULATIF DES DIAGNOSTICS")
         print("="*80)
-        df = pd.DataFrame(tous_resultats)
-        print(df.to_string(index=False))
+        print(formater_tableau(tous_resultats))
         
-        df.to_csv('resultats/diagnostics_patients.csv', index=False)
+        with open('resultats/diagnostics_patients.csv', 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(tous_resultats[0]), lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(tous_resultats)
         print("\n✓ Résultats sauvegardés: ReseauxBayesiens/resultats/diagnostics_patients.csv")
     
     def comparer_algorithmes(self):
@@ -554,19 +667,23 @@ class DiagnosticMedical:
         print("   • Méthode: Élimination successive des variables")
         print("   • Complexité: Dépend de l'ordre d'élimination")
         
-        import time
-        start = time.time()
-        inference_ve = VariableElimination(self.model)
-        result_ve = {}
-        for maladie in ['Grippe', 'COVID19', 'Allergie']:
-            res = inference_ve.query(variables=[maladie], evidence=evidences)
-            result_ve[maladie] = res.values[1]
-        time_ve = time.time() - start
+        # Les moteurs construits dans __init__ sont réutilisés : seules les requêtes sont
+        # chronométrées (BeliefPropagation recalibre de toute façon à chaque requête, sur le
+        # modèle élagué par les évidences, donc calibrate() n'est pas appelé au préalable)
+        inference_ve = self._ve
+        start = perf_counter_ns()
+        for _ in range(REPETITIONS_BENCHMARK):
+            jointe = inference_ve.query(variables=MALADIES, evidence=evidences, show_progress=False)
+            result_ve = {}
+            for maladie in MALADIES:
+                res = jointe.marginalize([m for m in MALADIES if m != maladie], inplace=False)
+                result_ve[maladie] = res.values[1]
+        time_ve = (perf_counter_ns() - start) / REPETITIONS_BENCHMARK / 1e9
         
         print(f"\n   Résultats:")
         for maladie, prob in result_ve.items():
             print(f"   • P({maladie}=Oui) = {prob:.4f} ({prob*100:.2f}%)")
-        print(f"   ⏱️  Temps d'exécution: {time_ve*1000:.2f} ms")
+        print(f"   ⏱️  Temps d'exécution: {time_ve*1000:.2f} ms (moyenne sur {REPETITIONS_BENCHMARK} exécutions)")
         
         # Test avec Belief Propagation
         print("\n" + "─"*80)
@@ -576,18 +693,20 @@ class DiagnosticMedical:
         print("   • Méthode: Passage de messages entre nœuds")
         print("   • Complexité: Linéaire pour les arbres")
         
-        start = time.time()
-        inference_bp = BeliefPropagation(self.model)
-        result_bp = {}
-        for maladie in ['Grippe', 'COVID19', 'Allergie']:
-            res = inference_bp.query(variables=[maladie], evidence=evidences)
-            result_bp[maladie] = res.values[1]
-        time_bp = time.time() - start
+        inference_bp = self._bp
+        start = perf_counter_ns()
+        for _ in range(REPETITIONS_BENCHMARK):
+            jointe = inference_bp.query(variables=MALADIES, evidence=evidences, show_progress=False)
+            result_bp = {}
+            for maladie in MALADIES:
+                res = jointe.marginalize([m for m in MALADIES if m != maladie], inplace=False)
+                result_bp[maladie] = res.values[1]
+        time_bp = (perf_counter_ns() - start) / REPETITIONS_BENCHMARK / 1e9
         
         print(f"\n   Résultats:")
         for maladie, prob in result_bp.items():
             print(f"   • P({maladie}=Oui) = {prob:.4f} ({prob*100:.2f}%)")
-        print(f"   ⏱️  Temps d'exécution: {time_bp*1000:.2f} ms")
+        print(f"   ⏱️  Temps d'exécution: {time_bp*1000:.2f} ms (moyenne sur {REPETITIONS_BENCHMARK} exécutions)")
         
         # Comparaison
         print("\n" + "="*80)
@@ -626,14 +745,15 @@ def main():
     print("║" + " "*15 + "RÉSEAU BAYÉSIEN - DIAGNOSTIC MÉDICAL RÉEL" + " "*22 + "║")
     print("╚" + "="*78 + "╝")
     
-    # Créer le modèle
-    diagnostic = DiagnosticMedical()
+    # Créer le modèle (--no-check : sans validation des CPDs)
+    diagnostic = DiagnosticMedical(verifier='--no-check' not in sys.argv)
     
     # Afficher la structure
     diagnostic.afficher_structure()
     
-    # Visualiser le réseau
-    diagnostic.visualiser_reseau()
+    # Visualiser le réseau (--no-plot : résultats seuls, sans figure)
+    if '--no-plot' not in sys.argv:
+        diagnostic.visualiser_reseau()
     
     # Comparer les algorithmes d'inférence
     diagnostic.comparer_algorithmes()
@@ -0,0 +1,79 @@
+"""
+Inférence exacte par contraction np.einsum des CPDs compilées, partagée par les étapes 2 et 3
+"""
+
+import numpy as np
+from pgmpy.factors.discrete import DiscreteFactor
+
+
+def compiler_tenseurs(model):
+    """
+    Compiler les CPDs du modèle en tableaux NumPy contigus, un axe par variable de la CPD
+    (dans l'ordre de cpd.variables). À recompiler si les CPDs du modèle changent.
+
+    Args:
+        model: DiscreteBayesianNetwork dont les CPDs sont définies
+
+    Returns:
+        Dictionnaire avec 'tenseurs' (liste de (tenseur, variables de ses axes)), 'lettres'
+        (indice einsum de chaque variable), 'etats' (états de chaque variable) et 'chemins'
+        (chemins einsum mémorisés par requete_einsum)
+    """
+    cpds = model.get_cpds()
+    return {
+        'tenseurs': [(np.ascontiguousarray(cpd.values, dtype=np.float64), tuple(cpd.variables))
+                     for cpd in cpds],
+        'lettres': {var: chr(ord('a') + i) for i, var in enumerate(model.nodes())},
+        'etats': {cpd.variable: cpd.state_names[cpd.variable] for cpd in cpds},
+        'chemins': {},
+    }
+
+
+def requete_einsum(compilees, variable, evidences=None):
+    """
+    Calculer P(variable | évidences) par une seule contraction np.einsum des CPDs
+    compilées, sans passer par VariableElimination
+
+    Args:
+        compilees: CPDs compilées par compiler_tenseurs
+        variable: Variable de requête
+        evidences: Dictionnaire des évidences {variable: état}
+
+    Returns:
+        DiscreteFactor normalisé (même forme que VariableElimination.query)
+
+    Raises:
+        ValueError: Variable ou état inconnu du réseau, ou variable de requête
+            également observée
+    """
+    evidences = evidences or {}
+    lettres, etats = compilees['lettres'], compilees['etats']
+    # Mêmes refus que VariableElimination.query, avant de construire l'expression einsum
+    inconnues = [var for var in [variable, *evidences] if var not in lettres]
+    if inconnues:
+        raise ValueError(f"Variables absentes du réseau: {inconnues}")
+    if variable in evidences:
+        raise ValueError(f"Variable à la fois interrogée et observée: {variable}")
+    for var, etat in evidences.items():
+        if etat not in etats[var]:
+            raise ValueError(f"État inconnu pour {var}: {etat!r} (attendu: {etats[var]})")
+    tenseurs, sous_indices = [], []
+    for tenseur, axes in compilees['tenseurs']:
+        # Fixer les axes observés à l'état de l'évidence
+        for var, etat in evidences.items():
+            if var in axes:
+                tenseur = tenseur.take(etats[var].index(etat), axis=axes.index(var))
+                axes = tuple(v for v in axes if v != var)
+        tenseurs.append(tenseur)
+        sous_indices.append(''.join(lettres[v] for v in axes))
+
+    expression = ','.join(sous_indices) + '->' + lettres[variable]
+    cle = (variable, frozenset(evidences))
+    chemins = compilees['chemins']
+    if cle not in chemins:
+        chemins[cle] = np.einsum_path(expression, *tenseurs, optimize='optimal')[0]
+    valeurs = np.einsum(expression, *tenseurs, optimize=chemins[cle])
+    valeurs /= valeurs.sum()
+
+    return DiscreteFactor([variable], [len(valeurs)], valeurs,
+                          state_names={variable: etats[variable]})
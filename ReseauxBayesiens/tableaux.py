@@ -0,0 +1,33 @@
+"""
+Mise en forme texte des tableaux de résultats des étapes 2 à 4, sans pandas
+"""
+
+
+def formater_tableau(resultats):
+    """
+    Tableau texte d'une liste de dicts (une ligne par dict, une colonne par clé), même
+    présentation que DataFrame.to_string(index=False) : colonnes alignées à droite,
+    réels à 6 décimales (zéros finaux communs retirés) et, comme pandas, une place
+    réservée au signe devant l'en-tête des colonnes numériques
+
+    Args:
+        resultats: Liste non vide de dictionnaires ayant les mêmes clés
+
+    Returns:
+        Chaîne multi-lignes (en-tête puis une ligne par résultat)
+    """
+    colonnes, largeurs = [], []
+    for cle in resultats[0]:
+        valeurs = [r[cle] for r in resultats]
+        numerique = isinstance(valeurs[0], (int, float)) and not isinstance(valeurs[0], bool)
+        if isinstance(valeurs[0], float):
+            cellules = [f"{v:.6f}" for v in valeurs]
+            while all(c.endswith('0') and not c.endswith('.0') for c in cellules):
+                cellules = [c[:-1] for c in cellules]
+        else:
+            cellules = [str(v) for v in valeurs]
+        colonnes.append([cle] + cellules)
+        largeurs.append(max(len(cle) + numerique, *(len(c) for c in cellules)))
+
+    return "\n".join(" ".join(c.rjust(l) for c, l in zip(ligne, largeurs))
+                     for ligne in zip(*colonnes))